@@ -108,12 +108,24 @@ STATIC_URL = "static/"
 REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 30,
+    "DEFAULT_RENDERER_CLASSES": [
+        "test_task.core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "test_task.core.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_AUTHENTICATION_CLASS": [
         "rest_framework.authentication.SessionAuthentication"
     ],
 }
 
 
+LEAN_SERIALIZERS = env.bool("LEAN_SERIALIZERS", default=False)
+
+
 REST_AUTH = {
     "USE_JWT": False,
     "SESSION_LOGIN": True,
@@ -139,6 +151,29 @@ CACHES = {
 
 CACHE_TTL = 60 * 5  # 5 хвилин
 
+# як часто буфер переглядів застосовується до view_count, секунди
+VIEW_COUNT_FLUSH_INTERVAL = env.int("VIEW_COUNT_FLUSH_INTERVAL", default=60)
+# перегляди detail пишуться в Redis у фоновому пулі потоків
+RECORD_VIEWS_IN_BACKGROUND = env.bool("RECORD_VIEWS_IN_BACKGROUND", default=True)
+VIEW_RECORDER_WORKERS = env.int("VIEW_RECORDER_WORKERS", default=4)
+
+# годинні бакети активності в Redis, секунди
+ACTIVITY_BUCKET_TTL = 48 * 60 * 60
+# скільки днів зберігати LocationActivity
+ACTIVITY_RETENTION_DAYS = 30
+# вікно для ordering=trending, години
+TRENDING_WINDOW_HOURS = 24
+
+WEATHER_CONCURRENCY = env.int("WEATHER_CONCURRENCY", default=20)
+# скільки detail чекає на погоду, перш ніж віддати weather: null, секунди
+WEATHER_TIMEOUT = env.float("WEATHER_TIMEOUT", default=2.0)
+
+HTTP_CACHE_MAX_AGE = env.int("HTTP_CACHE_MAX_AGE", default=0)
+
+
+LOCATION_INDEX_REBUILD_INTERVAL = 60 * 10  # 10 хвилин
+LOCATION_INDEX_PRELOAD = env.bool("LOCATION_INDEX_PRELOAD", default=False)
+
 
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = env("EMAIL_HOST")
@@ -157,3 +192,15 @@ AWS_ACCESS_KEY_ID = env("AWS_ACCESS_KEY_ID")
 AWS_SECRET_ACCESS_KEY = env("AWS_SECRET_ACCESS_KEY")
 AWS_STORAGE_BUCKET_NAME = env("AWS_STORAGE_BUCKET_NAME")
 AWS_S3_ENDPOINT_URL = f"https://{AWS_ACCOUNT_ID}.r2.cloudflarestorage.com"
+
+# фонові експорти
+EXPORT_PART_SIZE = 8 * 1024 * 1024  # мінімум для multipart - 5 МБ
+EXPORT_URL_EXPIRES = 60 * 60
+EXPORT_ROW_GROUP_SIZE = 50_000
+# CSV через COPY ... TO STDOUT, якщо база - PostgreSQL з psycopg2
+EXPORT_USE_COPY = env.bool("EXPORT_USE_COPY", default=True)
+EXPORT_COPY_CHUNK_SIZE = 64 * 1024
+
+# масовий імпорт локацій
+IMPORT_BATCH_SIZE = 1000
+IMPORT_MAX_REPORTED_ERRORS = 1000
@@ -14,3 +14,15 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.local')
 
 application = get_wsgi_application()
+
+from django.conf import settings
+
+if settings.LOCATION_INDEX_PRELOAD:
+    # будуємо k-NN індекс до fork, щоб воркери ділили його масиви
+    from django.db import connections
+
+    from test_task.locations.spatial import location_index
+
+    location_index.rebuild()
+    # інакше відкрите з'єднання успадкують усі воркери після fork
+    connections.close_all()
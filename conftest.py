@@ -1,7 +1,12 @@
 import pytest
+from django.core.cache import cache
 from rest_framework.test import APIClient
 
-from test_task.locations.tests.factories import LocationFactory, CategoryFactory
+from test_task.locations.tests.factories import (
+    CategoryFactory,
+    LocationActivityFactory,
+    LocationFactory,
+)
 from test_task.reviews.tests.factories import ReviewFactory, ReviewVoteFactory
 from test_task.users.tests.factories import UserFactory
 
@@ -26,6 +31,11 @@ def location_factory():
     return LocationFactory
 
 
+@pytest.fixture
+def location_activity_factory():
+    return LocationActivityFactory
+
+
 @pytest.fixture
 def review_factory():
     return ReviewFactory
@@ -34,3 +44,13 @@ def review_factory():
 @pytest.fixture
 def review_vote_factory():
     return ReviewVoteFactory
+
+
+@pytest.fixture
+def locmem_cache(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    yield cache
+    cache.clear()
@@ -1,13 +1,21 @@
 from django.urls import path
 
 from test_task.locations.api.v1.views import (
+    LocationBatchAPIView,
     LocationDetailAPIView,
     LocationExportCSVAPIView,
+    LocationExportJobCreateAPIView,
+    LocationExportJobDetailAPIView,
+    LocationExportParquetAPIView,
+    LocationImportAPIView,
+    LocationNearbyAPIView,
+    LocationPinsAPIView,
     AsyncLocationListCreateAPIView,
 )
 from test_task.reviews.api.v1.views import (
     ReviewListCreateAPIView,
     ReviewDetailAPIView,
+    ReviewImportAPIView,
     ReviewVoteCreateAPIView,
     ReviewVoteDetailAPIView,
 )
@@ -15,14 +23,41 @@ from test_task.reviews.api.v1.views import (
 app_name = "v1"
 urlpatterns = [
     path("locations/", AsyncLocationListCreateAPIView.as_view(), name="location_list"),
+    path("locations/pins/", LocationPinsAPIView.as_view(), name="location_pins"),
+    path("locations/batch/", LocationBatchAPIView.as_view(), name="location_batch"),
     path(
         "locations/<uuid:pk>/", LocationDetailAPIView.as_view(), name="location_detail"
     ),
+    path(
+        "locations/<uuid:pk>/nearby/",
+        LocationNearbyAPIView.as_view(),
+        name="location_nearby",
+    ),
+    path(
+        "locations/export/",
+        LocationExportJobCreateAPIView.as_view(),
+        name="location_export",
+    ),
+    path(
+        "locations/export/<uuid:pk>/",
+        LocationExportJobDetailAPIView.as_view(),
+        name="location_export_detail",
+    ),
+    path(
+        "locations/export/parquet/",
+        LocationExportParquetAPIView.as_view(),
+        name="location_export_parquet",
+    ),
     path(
         "locations/export/csv/",
         LocationExportCSVAPIView.as_view(),
         name="location_export_csv",
     ),
+    path(
+        "locations/import/",
+        LocationImportAPIView.as_view(),
+        name="location_import",
+    ),
     path(
         "locations/<uuid:location_id>/reviews/",
         ReviewListCreateAPIView.as_view(),
@@ -33,6 +68,7 @@ urlpatterns = [
         ReviewDetailAPIView.as_view(),
         name="review_detail",
     ),
+    path("reviews/import/", ReviewImportAPIView.as_view(), name="review_import"),
     path(
         "reviews/<uuid:review_id>/votes/",
         ReviewVoteCreateAPIView.as_view(),
@@ -0,0 +1,57 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+
+LOCATION_LIST_NAMESPACE = "location_list"
+REVIEW_LIST_NAMESPACE = "review_list"
+
+
+def location_namespace(location_id):
+    return f"location:{location_id}"
+
+
+def review_list_namespace(location_id):
+    return f"{REVIEW_LIST_NAMESPACE}:{location_id}"
+
+
+def namespace_version_key(namespace):
+    return f"namespace:{namespace}:version"
+
+
+def get_namespace_version(namespace):
+    key = namespace_version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        # стартуємо з часу, щоб після витіснення ключа не повторити старі версії
+        cache.add(key, int(time.time()), timeout=None)
+        version = cache.get(key, 0)
+    return version
+
+
+def bump_namespace_version(namespace):
+    # один INCR замість SCAN по всьому keyspace: старі ключі просто
+    # перестають читатись і витісняються по TTL
+    key = namespace_version_key(namespace)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, int(time.time()), timeout=None)
+
+
+def request_fingerprint(request):
+    params = urlencode(sorted(request.query_params.lists()), doseq=True)
+    return hashlib.md5(
+        f"{request.path}?{params}".encode(), usedforsecurity=False
+    ).hexdigest()
+
+
+def make_list_cache_key(namespace, request, variant="public"):
+    version = get_namespace_version(namespace)
+    return f"{namespace}:v{version}:{variant}:{request_fingerprint(request)}"
+
+
+def make_object_cache_key(namespace, request, variant="public"):
+    # той самий формат: namespace об'єкта інвалідується bump_namespace_version
+    return make_list_cache_key(namespace, request, variant)
@@ -0,0 +1,69 @@
+import csv
+import io
+from itertools import islice
+
+import orjson
+from django.conf import settings
+
+
+def read_csv(file):
+    reader = csv.DictReader(io.TextIOWrapper(file, encoding="utf-8-sig"))
+    yield from reader
+
+
+def read_ndjson(file):
+    for line in file:
+        if not line.strip():
+            continue
+        try:
+            yield orjson.loads(line)
+        except orjson.JSONDecodeError:
+            # серіалізатор звітує про рядок як про "не об'єкт"
+            yield line.decode(errors="replace")
+
+
+class BatchImporter:
+    # Імпорт пачками: кожен рядок валідує row_serializer_class, невалідні
+    # потрапляють у звіт (не більше max_errors), валідні йдуть в
+    # import_batch() пачкою. finish() викликається один раз наприкінці,
+    # навіть якщо імпорт упав посередині.
+    row_serializer_class = None
+
+    def __init__(self, batch_size=None, max_errors=None):
+        self.batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        self.max_errors = max_errors or settings.IMPORT_MAX_REPORTED_ERRORS
+        self.error_count = 0
+        self.errors = []
+
+    def run(self, rows):
+        rows = enumerate(rows, start=1)
+        try:
+            while batch := list(islice(rows, self.batch_size)):
+                self.import_batch(self.validate(batch))
+        finally:
+            self.finish()
+        return self.get_report()
+
+    def validate(self, batch):
+        valid = []
+        for row_number, row in batch:
+            serializer = self.row_serializer_class(data=row)
+            if serializer.is_valid():
+                valid.append((row_number, serializer.validated_data))
+            else:
+                self.add_error(row_number, serializer.errors)
+        return valid
+
+    def import_batch(self, rows):
+        raise NotImplementedError
+
+    def finish(self):
+        pass
+
+    def add_error(self, row_number, errors):
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row_number, "errors": errors})
+
+    def get_report(self):
+        return {"error_count": self.error_count, "errors": self.errors}
@@ -0,0 +1,80 @@
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from test_task.core.renderers import ORJSONRenderer
+from test_task.locations.api.v1.serializers import LocationListSerializer
+from test_task.locations.models import Location
+from test_task.reviews.api.v1.serializers import ReviewListSerializer
+from test_task.reviews.models import Review
+
+WEATHER_SAMPLE = {
+    "temperature": 21.4,
+    "feels_like": 20.9,
+    "description": "scattered clouds",
+    "humidity": 48,
+    "wind_speed": 3.1,
+}
+
+
+class Command(BaseCommand):
+    help = "Compares JSON rendering time of the stdlib and orjson renderers."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, rows, repeat, **options):
+        locations = Location.objects.select_related("category")
+        locations = locations.annotate_average_rating()
+        locations = locations.annotate_review_count()
+        locations = locations.annotate_popularity_score()
+        location_list = LocationListSerializer(locations[:rows], many=True).data
+        for loc in location_list:
+            loc["weather"] = WEATHER_SAMPLE
+
+        reviews = Review.objects.select_related("user")
+        review_list = ReviewListSerializer(reviews[:rows], many=True).data
+
+        # .values() як у експорті: сирі UUID, Decimal і datetime
+        export = list(
+            Location.objects.values(
+                "id",
+                "name",
+                "description",
+                "category_id",
+                "category__name",
+                "latitude",
+                "longitude",
+                "address",
+                "is_active",
+                "view_count",
+                "created_at",
+            )[:rows]
+        )
+
+        for label, payload in (
+            ("location list", {"results": location_list}),
+            ("review list", {"results": review_list}),
+            ("export rows", export),
+        ):
+            self.report(label, payload, repeat)
+
+    def report(self, label, payload, repeat):
+        stdlib = self.measure(JSONRenderer(), payload, repeat)
+        fast = self.measure(ORJSONRenderer(), payload, repeat)
+        size = len(ORJSONRenderer().render(payload))
+        self.stdout.write(
+            f"{label}: {size} bytes, "
+            f"json {stdlib * 1e3:.2f} ms, orjson {fast * 1e3:.2f} ms "
+            f"({stdlib / fast:.1f}x)"
+        )
+
+    def measure(self, renderer, payload, repeat):
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            renderer.render(payload)
+            best = min(best, time.perf_counter() - started)
+        return best
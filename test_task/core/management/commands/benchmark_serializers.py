@@ -0,0 +1,75 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from test_task.locations.api.v1.serializers import (
+    LocationListSerializer,
+    LocationListValuesSerializer,
+)
+from test_task.locations.models import Location
+from test_task.reviews.api.v1.serializers import (
+    ReviewListSerializer,
+    ReviewListValuesSerializer,
+)
+from test_task.reviews.models import Review
+
+
+class Command(BaseCommand):
+    help = "Compares per-row serialization cost of DRF and values serializers."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, rows, repeat, **options):
+        locations = Location.objects.select_related("category")
+        locations = locations.annotate_average_rating()
+        locations = locations.annotate_review_count()
+        locations = locations.annotate_popularity_score()
+
+        reviews = Review.objects.select_related("user")
+
+        self.report(
+            "locations",
+            locations,
+            LocationListSerializer,
+            LocationListValuesSerializer,
+            rows,
+            repeat,
+        )
+        self.report(
+            "reviews",
+            reviews,
+            ReviewListSerializer,
+            ReviewListValuesSerializer,
+            rows,
+            repeat,
+        )
+
+    def report(self, label, queryset, serializer_class, lean_class, rows, repeat):
+        lean_serializer = lean_class(queryset)
+        instances = list(queryset[:rows])
+        values = list(lean_serializer.get_queryset(queryset)[:rows])
+        if not instances:
+            self.stdout.write(f"{label}: no rows to benchmark")
+            return
+
+        # час лише серіалізації, запити в базу виконані вище
+        drf = self.measure(lambda: serializer_class(instances, many=True).data, repeat)
+        lean = self.measure(lambda: lean_serializer.to_representation(values), repeat)
+
+        count = len(instances)
+        self.stdout.write(
+            f"{label}: {count} rows, "
+            f"DRF {drf / count * 1e6:.1f} us/row, "
+            f"values {lean / count * 1e6:.1f} us/row "
+            f"({drf / lean:.1f}x)"
+        )
+
+    def measure(self, func, repeat):
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - started)
+        return best
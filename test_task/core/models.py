@@ -17,9 +17,18 @@ class TimestampedModel(models.Model):
             )
         ]
 
+    def save(self, *args, **kwargs):
+        # updated_at - курсор для updated_since, тож оновлюємо його і при
+        # save(update_fields=...). queryset.update() його не чіпає
+        self.updated_at = timezone.now()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "updated_at"}
+        super().save(*args, **kwargs)
+
 
 class UUIDModel(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
 
     class Meta:
-        abstract = True
\ No newline at end of file
+        abstract = True
@@ -0,0 +1,98 @@
+import base64
+import operator
+from functools import reduce
+
+import orjson
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    # Сторінка - WHERE (key) < (останній key попередньої сторінки) по
+    # індексу замість OFFSET, тож глибина сторінки не впливає на вартість.
+    # ordering має закінчуватись унікальним полем, напр. ("-score", "-id").
+    cursor_query_param = "cursor"
+    page_size = api_settings.PAGE_SIZE
+    ordering = ()
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.current_ordering = tuple(self.get_ordering(request, queryset, view))
+        queryset = queryset.order_by(*self.current_ordering)
+
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(position))
+
+        # ключі окремим вузьким запитом по індексу: рядки сторінки можуть
+        # бути кортежами values_list() без потрібних колонок
+        keys = list(queryset.values_list(*self.get_key_fields())[: self.page_size + 1])
+        self.next_position = None
+        if len(keys) > self.page_size:
+            self.next_position = keys[self.page_size - 1]
+        return list(queryset[: self.page_size])
+
+    def get_ordering(self, request, queryset, view):
+        return self.ordering
+
+    def get_key_fields(self):
+        return [term.lstrip("-") for term in self.current_ordering]
+
+    def get_position_filter(self, position):
+        # (a, b) < (x, y)  ->  a < x OR (a = x AND b < y)
+        fields = self.get_key_fields()
+        conditions = []
+        for index, term in enumerate(self.current_ordering):
+            lookup = "lt" if term.startswith("-") else "gt"
+            equal = dict(zip(fields[:index], position[:index]))
+            conditions.append(
+                Q(**equal, **{f"{fields[index]}__{lookup}": position[index]})
+            )
+        return reduce(operator.or_, conditions)
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = orjson.loads(base64.urlsafe_b64decode(encoded.encode()))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        fields = self.get_key_fields()
+        if not isinstance(position, list) or len(position) != len(fields):
+            raise NotFound(self.invalid_cursor_message)
+
+        # курсор приходить від клієнта: значення без приведення до типу
+        # поля дали б 500 з БД замість 404
+        try:
+            position = [
+                model._meta.get_field(field).to_python(value)
+                for field, value in zip(fields, position)
+            ]
+        except (ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if None in position:
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def encode_cursor(self, position):
+        data = orjson.dumps(list(position), default=str)
+        return base64.urlsafe_b64encode(data).decode()
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(self.next_position),
+        )
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
@@ -0,0 +1,75 @@
+from decimal import Decimal
+from operator import itemgetter
+
+from rest_framework.fields import DateTimeField, empty
+
+
+def decimal_to_string(decimal_places):
+    quantum = Decimal(1).scaleb(-decimal_places)
+
+    def convert(value):
+        return str(value.quantize(quantum))
+
+    return convert
+
+
+def datetime_to_string():
+    # той самий ISO-формат і часовий пояс, що й у DateTimeField DRF
+    return DateTimeField().to_representation
+
+
+def compile_extractor(fields, annotations, lookups):
+    # перетворює опис полів на функцію row -> dict; lookups накопичує
+    # колонки для values_list() у тому ж порядку, що й індекси
+    getters = []
+    for name, field in fields.items():
+        if isinstance(field, dict):
+            getters.append((name, compile_extractor(field, annotations, lookups)))
+            continue
+
+        lookup, convert, *default = field
+        if default and lookup not in annotations:
+            # анотації немає: підставляємо default або пропускаємо поле,
+            # як це робить read_only поле DRF без атрибута
+            if default[0] is not empty:
+                getters.append((name, lambda row, value=default[0]: value))
+            continue
+
+        getter = itemgetter(len(lookups))
+        lookups.append(lookup)
+        if convert is None:
+            getters.append((name, getter))
+        else:
+            getters.append((name, lambda row, g=getter, c=convert: c(g(row))))
+
+    def extract(row):
+        return {name: get(row) for name, get in getters}
+
+    return extract
+
+
+class ValuesSerializer:
+    # Read-only серіалізатор поверх кортежів .values_list(): без моделей і
+    # полів DRF на кожен рядок, але з тією ж JSON-формою, що й ModelSerializer.
+    #
+    # fields: name -> (lookup, convert), вкладений dict для nested полів або
+    # (lookup, convert, default) для анотацій, яких у queryset може не бути.
+    # Аргумент fields обмежує вивід і колонки підмножиною верхніх полів.
+    fields = {}
+
+    def __init__(self, queryset, fields=None):
+        selected = self.fields
+        if fields is not None:
+            selected = {
+                name: field for name, field in selected.items() if name in fields
+            }
+        self.lookups = []
+        self.extract = compile_extractor(
+            selected, queryset.query.annotations, self.lookups
+        )
+
+    def get_queryset(self, queryset):
+        return queryset.values_list(*self.lookups)
+
+    def to_representation(self, rows):
+        return [self.extract(row) for row in rows]
@@ -1,3 +1,115 @@
-from django.test import TestCase
+import io
+import json
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
 
-# Create your tests here.
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+from rest_framework.request import Request
+
+from test_task.core.parsers import ORJSONParser
+from test_task.core.renderers import NDJSONRenderer, ORJSONRenderer
+
+from test_task.core.cache import (
+    bump_namespace_version,
+    get_namespace_version,
+    make_list_cache_key,
+)
+
+
+def make_request(path, params=None):
+    return Request(APIRequestFactory().get(path, params))
+
+
+class TestNamespaceVersion:
+
+    def test_version_is_stable_until_bumped(self, locmem_cache):
+        version = get_namespace_version("things")
+        assert get_namespace_version("things") == version
+
+        bump_namespace_version("things")
+        assert get_namespace_version("things") == version + 1
+
+    def test_bump_without_version_initializes_it(self, locmem_cache):
+        bump_namespace_version("things")
+        assert get_namespace_version("things") is not None
+
+    def test_namespaces_are_independent(self, locmem_cache):
+        other_version = get_namespace_version("other")
+        bump_namespace_version("things")
+        assert get_namespace_version("other") == other_version
+
+
+class TestMakeListCacheKey:
+
+    def test_key_changes_after_bump(self, locmem_cache):
+        request = make_request("/api/v1/locations/", {"page": 2})
+        key = make_list_cache_key("things", request)
+
+        bump_namespace_version("things")
+        assert make_list_cache_key("things", request) != key
+
+    def test_key_ignores_param_order(self, locmem_cache):
+        first = make_request("/api/v1/locations/?page=2&ordering=name")
+        second = make_request("/api/v1/locations/?ordering=name&page=2")
+        assert make_list_cache_key("things", first) == make_list_cache_key(
+            "things", second
+        )
+
+    def test_key_depends_on_params_path_and_variant(self, locmem_cache):
+        request = make_request("/api/v1/locations/", {"page": 2})
+        key = make_list_cache_key("things", request)
+
+        assert make_list_cache_key("things", make_request("/api/v1/locations/")) != key
+        assert (
+            make_list_cache_key("things", make_request("/other/", {"page": 2})) != key
+        )
+        assert make_list_cache_key("things", request, "staff") != key
+
+
+class TestORJSONRenderer:
+
+    def test_matches_stdlib_renderer(self):
+        data = {
+            "id": uuid.uuid4(),
+            "latitude": Decimal("50.450100"),
+            "created_at": datetime(2025, 6, 25, 13, 50, tzinfo=timezone.utc),
+            "name": gettext_lazy("Name"),
+            "items": [1, 2.5, None, True],
+        }
+
+        actual = json.loads(ORJSONRenderer().render(data))
+        expected = json.loads(JSONRenderer().render(data))
+        assert actual == expected
+
+    def test_escapes_line_separators(self):
+        assert ORJSONRenderer().render({"a": "x\u2028y"}) == b'{"a":"x\\u2028y"}'
+
+    def test_indent_falls_back_to_stdlib(self):
+        rendered = ORJSONRenderer().render({"a": 1}, "application/json; indent=4", {})
+        assert rendered == b'{\n    "a": 1\n}'
+
+
+class TestNDJSONRenderer:
+
+    def test_renders_one_record_per_line(self):
+        rendered = NDJSONRenderer().render([{"a": 1}, {"a": "x\ny"}])
+        assert rendered == b'{"a":1}\n{"a":"x\\ny"}\n'
+
+    def test_renders_single_object_as_one_line(self):
+        assert NDJSONRenderer().render({"detail": "error"}) == b'{"detail":"error"}\n'
+
+
+class TestORJSONParser:
+
+    def test_parse(self):
+        stream = io.BytesIO('{"name": "Київ", "rating": 5}'.encode())
+        assert ORJSONParser().parse(stream) == {"name": "Київ", "rating": 5}
+
+    def test_parse_error(self):
+        with pytest.raises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b"{"))
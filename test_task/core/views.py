@@ -1,3 +1,113 @@
-from django.shortcuts import render
+import hashlib
+import time
 
-# Create your views here.
+from django.conf import settings
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from rest_framework.exceptions import ValidationError
+
+
+class ConditionalGetMixin:
+    # ETag будується з дешевих версій namespace, тому 304 віддається
+    # до того, як виконається важкий queryset
+
+    def get_etag_parts(self):
+        raise NotImplementedError
+
+    def get_time_bucket(self):
+        # для даних, що змінюються без bump namespace (погода, лічильники):
+        # ETag старіє разом з кешем, тобто раз на CACHE_TTL
+        return int(time.time()) // settings.CACHE_TTL
+
+    def get_etag(self, request):
+        parts = [*self.get_etag_parts(), request.accepted_renderer.format]
+        digest = hashlib.md5(
+            "|".join(str(part) for part in parts).encode(), usedforsecurity=False
+        ).hexdigest()
+        return f'"{digest}"'
+
+    def check_not_modified(self, request):
+        self.etag = self.get_etag(request)
+        return get_conditional_response(request, etag=self.etag)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+
+        etag = getattr(self, "etag", None)
+        if etag is None or response.status_code not in (200, 304):
+            return response
+
+        response["ETag"] = etag
+        if request.user.is_authenticated:
+            patch_cache_control(response, private=True, no_cache=True)
+        else:
+            patch_cache_control(
+                response,
+                public=True,
+                max_age=settings.HTTP_CACHE_MAX_AGE,
+                must_revalidate=True,
+            )
+        patch_vary_headers(response, ("Accept", "Cookie", "Authorization"))
+        return response
+
+
+class LeanSerializerMixin:
+    # opt-in через LEAN_SERIALIZERS: список серіалізується з .values_list()
+    lean_serializer_class = None
+
+    def get_lean_serializer(self, queryset, fields=None):
+        if not settings.LEAN_SERIALIZERS or self.lean_serializer_class is None:
+            return None
+        return self.lean_serializer_class(queryset, fields=fields)
+
+    def serialize_rows(self, rows, lean_serializer):
+        if lean_serializer is None:
+            return self.get_serializer(rows, many=True).data
+        return lean_serializer.to_representation(rows)
+
+
+class SparseFieldsetMixin:
+    # ?fields=id,name обрізає відповідь GET; get_queryset() може
+    # використати get_sparse_fields(), щоб не вибирати зайві колонки
+    sparse_fields_param = "fields"
+    # поле -> поля, без яких його не віддати
+    sparse_field_dependencies = {}
+
+    def get_sparse_fields(self):
+        if self.request.method not in ("GET", "HEAD"):
+            return None
+        if not hasattr(self, "_sparse_fields"):
+            self._sparse_fields = self.parse_sparse_fields()
+        return self._sparse_fields
+
+    def parse_sparse_fields(self):
+        raw = self.request.query_params.get(self.sparse_fields_param)
+        if not raw:
+            return None
+
+        requested = {name.strip() for name in raw.split(",") if name.strip()}
+        unknown = requested - set(self.get_serializer_class()().fields)
+        if unknown:
+            raise ValidationError(
+                {
+                    self.sparse_fields_param: f"Unknown fields: {', '.join(sorted(unknown))}."
+                }
+            )
+
+        for name in tuple(requested):
+            requested.update(self.sparse_field_dependencies.get(name, ()))
+        return frozenset(requested)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return serializer
+
+        target = getattr(serializer, "child", serializer)
+        for name in set(target.fields) - fields:
+            target.fields.pop(name)
+        return serializer
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from test_task.locations.models import Location, Category
+from test_task.locations.models import Category, ExportJob, Location
 
 
 @admin.register(Category)
@@ -11,3 +11,9 @@ class CategoryAdmin(admin.ModelAdmin):
 @admin.register(Location)
 class LocationAdmin(admin.ModelAdmin):
     pass
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "status", "row_count", "created_at")
+    list_filter = ("status",)
@@ -1,4 +1,10 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
 from django_filters import rest_framework as filters
+from rest_framework import filters as drf_filters
+from rest_framework.exceptions import ValidationError
 
 from test_task.locations.models import Location
 
@@ -13,6 +19,9 @@ class LocationFilterSet(filters.FilterSet):
     average_rating_max = filters.NumberFilter(
         field_name="average_rating", lookup_expr="lte"
     )
+    updated_since = filters.IsoDateTimeFilter(
+        field_name="updated_at", lookup_expr="gte"
+    )
 
     class Meta:
         model = Location
@@ -21,4 +30,91 @@ class LocationFilterSet(filters.FilterSet):
             "category_name",
             "average_rating_min",
             "average_rating_max",
+            "updated_since",
         )
+
+
+class DistanceFilterBackend(drf_filters.BaseFilterBackend):
+    origin_param = "from"
+    radius_param = "radius"
+    default_radius_m = 50_000
+    max_radius_m = 500_000
+
+    def filter_queryset(self, request, queryset, view):
+        origin = request.query_params.get(self.origin_param)
+        if not origin:
+            return queryset
+
+        latitude, longitude = self.parse_origin(origin)
+        radius_m = self.parse_radius(request.query_params.get(self.radius_param))
+
+        queryset = queryset.within_bounding_box(latitude, longitude, radius_m)
+        queryset = queryset.annotate_distance(latitude, longitude)
+        return queryset.filter(distance_m__lte=radius_m)
+
+    def parse_origin(self, value):
+        try:
+            latitude, longitude = (float(part) for part in value.split(","))
+        except ValueError:
+            raise ValidationError({self.origin_param: ["Expected `lat,lon`."]})
+
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValidationError(
+                {self.origin_param: ["Coordinates are out of range."]}
+            )
+        return latitude, longitude
+
+    def parse_radius(self, value):
+        if value is None:
+            return self.default_radius_m
+
+        try:
+            radius_m = float(value)
+        except ValueError:
+            raise ValidationError({self.radius_param: ["Expected a number."]})
+
+        if not 0 < radius_m <= self.max_radius_m:
+            raise ValidationError(
+                {
+                    self.radius_param: [
+                        f"Must be between 0 and {self.max_radius_m} meters."
+                    ]
+                }
+            )
+        return radius_m
+
+
+class LocationOrderingFilter(drf_filters.OrderingFilter):
+    distance_field = "distance"
+    trending_field = "trending"
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+
+        has_distance = "distance_m" in queryset.query.annotations
+        result = []
+        for term in ordering:
+            field = term.lstrip("-")
+            if field == self.trending_field:
+                result.append(f"{term}_score")
+            elif field != self.distance_field:
+                result.append(term)
+            elif has_distance:
+                result.append(f"{term}_m")
+
+        # id як tie-breaker, щоб сторінки були стабільними при однакових значеннях
+        if any(term.lstrip("-") in ("distance_m", "trending_score") for term in result):
+            result.append("id")
+        return result
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        if not ordering:
+            return queryset
+
+        if any(term.lstrip("-") == "trending_score" for term in ordering):
+            since = timezone.now() - timedelta(hours=settings.TRENDING_WINDOW_HOURS)
+            queryset = queryset.annotate_trending_score(since)
+        return queryset.order_by(*ordering)
@@ -0,0 +1,42 @@
+import struct
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+
+# Little-endian layout:
+#   b"PIN1", uint32 count, uint16 category_count
+#   category_count x (16 bytes uuid, uint16 name_length, utf-8 name)
+#   count x 16 bytes uuid
+#   count x float32 latitude
+#   count x float32 longitude
+#   count x float32 popularity_score
+#   count x uint16 index into categories
+class PinsBinaryRenderer(BaseRenderer):
+    media_type = "application/octet-stream"
+    format = "bin"
+    charset = None
+    render_style = "binary"
+
+    magic = b"PIN1"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if "id" not in data:
+            # помилки (403, 400 ...) віддаємо як json
+            return JSONRenderer().render(data)
+
+        count = len(data["id"])
+        categories = data["categories"]
+        chunks = [self.magic, struct.pack("<IH", count, len(categories))]
+
+        for category in categories:
+            name = category["name"].encode()
+            chunks.append(category["id"].bytes)
+            chunks.append(struct.pack("<H", len(name)))
+            chunks.append(name)
+
+        chunks.extend(location_id.bytes for location_id in data["id"])
+        chunks.append(struct.pack(f"<{count}f", *data["latitude"]))
+        chunks.append(struct.pack(f"<{count}f", *data["longitude"]))
+        chunks.append(struct.pack(f"<{count}f", *data["popularity_score"]))
+        chunks.append(struct.pack(f"<{count}H", *data["category"]))
+        return b"".join(chunks)
@@ -3,8 +3,16 @@ import asyncio
 import aiohttp
 from django.conf import settings
 from rest_framework import serializers
+from rest_framework.fields import empty
 
-from test_task.locations.models import Location, Category
+from test_task.core.serializers import (
+    ValuesSerializer,
+    datetime_to_string,
+    decimal_to_string,
+)
+from test_task.locations.exports import build_filterset, get_download_url
+from test_task.locations.imports import IMPORT_READERS
+from test_task.locations.models import Category, ExportJob, Location
 
 
 class CategoryNestedSerializer(serializers.ModelSerializer):
@@ -18,6 +26,7 @@ class LocationListSerializer(serializers.ModelSerializer):
     average_rating = serializers.FloatField(default=0)
     review_count = serializers.IntegerField(default=0)
     popularity_score = serializers.FloatField(default=0)
+    distance_m = serializers.FloatField(read_only=True)
     weather = serializers.DictField(read_only=True)
 
     class Meta:
@@ -31,19 +40,60 @@ class LocationListSerializer(serializers.ModelSerializer):
             "address",
             "is_active",
             "view_count",
+            "unique_viewers",
             "average_rating",
             "review_count",
             "popularity_score",
+            "distance_m",
+            "updated_at",
             "weather",
         )
         read_only_fields = fields
 
 
+class LocationListValuesSerializer(ValuesSerializer):
+    fields = {
+        "id": ("id", str),
+        "name": ("name", None),
+        "category_name": ("category__name", None),
+        "latitude": ("latitude", decimal_to_string(6)),
+        "longitude": ("longitude", decimal_to_string(6)),
+        "address": ("address", None),
+        "is_active": ("is_active", None),
+        "view_count": ("view_count", None),
+        "unique_viewers": ("unique_viewers", None),
+        "average_rating": ("average_rating", float, 0.0),
+        "review_count": ("review_count", int, 0),
+        "popularity_score": ("popularity_score", float, 0.0),
+        "distance_m": ("distance_m", float, empty),
+        "updated_at": ("updated_at", datetime_to_string()),
+    }
+
+
+class LocationNearbySerializer(serializers.ModelSerializer):
+    category_name = serializers.CharField(source="category.name")
+    distance_m = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = Location
+        fields = (
+            "id",
+            "name",
+            "category_name",
+            "latitude",
+            "longitude",
+            "address",
+            "distance_m",
+        )
+        read_only_fields = fields
+
+
 class LocationRetrieveSerializer(serializers.ModelSerializer):
     category = CategoryNestedSerializer()
     average_rating = serializers.FloatField(default=0)
     review_count = serializers.IntegerField(default=0)
     popularity_score = serializers.FloatField(default=0)
+    weather = serializers.DictField(read_only=True, allow_null=True)
 
     class Meta:
         model = Location
@@ -57,9 +107,12 @@ class LocationRetrieveSerializer(serializers.ModelSerializer):
             "address",
             "is_active",
             "view_count",
+            "unique_viewers",
             "average_rating",
             "review_count",
             "popularity_score",
+            "updated_at",
+            "weather",
         )
         read_only_fields = fields
 
@@ -90,3 +143,62 @@ class LocationUpdateSerializer(serializers.ModelSerializer):
             "longitude": {"required": False},
             "address": {"required": False},
         }
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = (
+            "id",
+            "status",
+            "format",
+            "filters",
+            "row_count",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+            "download_url",
+        )
+        read_only_fields = (
+            "id",
+            "status",
+            "row_count",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+        )
+
+    def validate_filters(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError("Expected an object.")
+
+        filterset = build_filterset(value)
+        if not filterset.is_valid():
+            raise serializers.ValidationError(filterset.errors)
+        # зберігаємо лише параметри, які знає LocationFilterSet
+        return {name: value[name] for name in filterset.filters if name in value}
+
+    def get_download_url(self, obj):
+        if obj.status != ExportJob.Status.DONE:
+            return None
+        return get_download_url(obj)
+
+
+class LocationImportSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    format = serializers.ChoiceField(choices=sorted(IMPORT_READERS), required=False)
+
+    def validate(self, attrs):
+        if "format" not in attrs:
+            # формат за розширенням файлу
+            extension = attrs["file"].name.rpartition(".")[2].lower()
+            if extension not in IMPORT_READERS:
+                raise serializers.ValidationError(
+                    {"format": ["Cannot guess the format from the file name."]}
+                )
+            attrs["format"] = extension
+        return attrs
@@ -1,154 +1,478 @@
 import asyncio
+import hashlib
+import uuid
+from itertools import chain, islice
 
 import redis.asyncio as redis
 
-import pandas as pd
-from asgiref.sync import sync_to_async
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
 from django.core.cache import cache
 from adrf import generics as async_generics
 from adrf import mixins as async_mixins
 
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import generics, filters, views, permissions, response
-
-from .filters import LocationFilterSet
+from rest_framework import generics, filters, views, permissions, response, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+
+from .filters import (
+    DistanceFilterBackend,
+    LocationFilterSet,
+    LocationOrderingFilter,
+)
 from .permissions import IsAdminOrReadOnly
+from .renderers import PinsBinaryRenderer
 from .serializers import (
+    ExportJobSerializer,
     LocationCreateSerializer,
+    LocationImportSerializer,
     LocationListSerializer,
+    LocationListValuesSerializer,
+    LocationNearbySerializer,
     LocationUpdateSerializer,
     LocationRetrieveSerializer,
 )
-from test_task.locations.models import Location
+from test_task.core.cache import (
+    LOCATION_LIST_NAMESPACE,
+    bump_namespace_version,
+    get_namespace_version,
+    location_namespace,
+    make_list_cache_key,
+    make_object_cache_key,
+    request_fingerprint,
+)
+from test_task.core.renderers import NDJSONRenderer, ORJSONRenderer
+from test_task.core.views import (
+    ConditionalGetMixin,
+    LeanSerializerMixin,
+    SparseFieldsetMixin,
+)
+from test_task.locations.counters import record_location_view, view_recorder
+from test_task.locations.exports import (
+    CSV_HEADER,
+    build_filterset,
+    can_copy,
+    get_csv_queryset,
+    get_parquet_rows,
+    iter_chunks,
+    iter_copy_csv,
+    iter_csv_rows,
+    iter_parquet,
+)
+from test_task.locations.imports import IMPORT_READERS, LocationImporter
+from test_task.locations.models import Category, ExportJob, Location
+from test_task.locations.spatial import location_index
 from ...services import (
     fetch_weather,
+    get_many_weather_from_redis,
     get_weather_from_redis,
     get_weather_from_s3,
     set_weather_in_redis,
     cache_weather,
+    weather_cache_key,
 )
 
 
-class LocationQuerySetMixin:
+class LocationQuerySetMixin(SparseFieldsetMixin):
+    # анотація -> анотації, на яких вона побудована
+    annotation_dependencies = {
+        "average_rating": (),
+        "review_count": (),
+        "popularity_score": ("average_rating", "review_count"),
+    }
+    # поле відповіді -> колонки для only(), якщо це не поле моделі
+    sparse_field_columns = {
+        "category_name": ("category__name",),
+        "category": ("category__name",),
+    }
+    sparse_field_dependencies = {"weather": ("latitude", "longitude")}
 
     def get_queryset(self):
+        fields = self.get_sparse_fields()
+        annotations = self.get_required_annotations(fields)
+
         queryset = Location.objects.select_related("category")
-        queryset = queryset.prefetch_related("reviews")
-        queryset = queryset.annotate_average_rating()
-        queryset = queryset.annotate_review_count()
-        queryset = queryset.annotate_popularity_score()
+        if "average_rating" in annotations:
+            queryset = queryset.annotate_average_rating()
+        if "review_count" in annotations:
+            queryset = queryset.annotate_review_count()
+        if "popularity_score" in annotations:
+            queryset = queryset.annotate_popularity_score()
+
+        if fields is not None:
+            columns = self.get_sparse_columns(fields)
+            if not any(column.startswith("category__") for column in columns):
+                queryset = queryset.select_related(None)
+            queryset = queryset.only(*columns)
 
         if self.request.user.is_staff:
             return queryset
         return queryset.filter(is_active=True)
 
+    def get_required_annotations(self, fields):
+        if fields is None:
+            return set(self.annotation_dependencies)
+
+        # анотації потрібні і для фільтрів та сортування, а не лише для виводу
+        names = set(fields)
+        names.update(
+            term.strip().lstrip("-")
+            for term in self.request.query_params.get("ordering", "").split(",")
+        )
+        if {"average_rating_min", "average_rating_max"} & set(
+            self.request.query_params
+        ):
+            names.add("average_rating")
+
+        required = set()
+        for name in names & set(self.annotation_dependencies):
+            required.add(name)
+            required.update(self.annotation_dependencies[name])
+        return required
+
+    def get_sparse_columns(self, fields):
+        model_fields = {field.name for field in Location._meta.concrete_fields}
+        columns = {"id"}
+        for name in fields:
+            if name in self.sparse_field_columns:
+                columns.update(self.sparse_field_columns[name])
+            elif name in model_fields:
+                columns.add(name)
+        return sorted(columns)
+
+    def get_cache_variant(self):
+        return "staff" if self.request.user.is_staff else "public"
+
+
+class WeatherEnrichmentMixin:
+
+    async def enrich_many(self, locs, redis_client):
+        fields = self.get_sparse_fields()
+        if fields is not None and "weather" not in fields:
+            return locs
+
+        # один MGET на всю пачку, промахи йдуть звичним шляхом s3 -> api
+        redis_keys = [
+            f"weather:{weather_cache_key(loc['latitude'], loc['longitude'])}"
+            for loc in locs
+        ]
+        cached = await get_many_weather_from_redis(redis_client, redis_keys)
+
+        misses = []
+        for loc, weather in zip(locs, cached):
+            if weather:
+                loc["weather"] = weather
+            else:
+                misses.append(loc)
+
+        semaphore = asyncio.Semaphore(settings.WEATHER_CONCURRENCY)
+        await asyncio.gather(
+            *(self.enrich_bounded(loc, redis_client, semaphore) for loc in misses)
+        )
+        return locs
+
+    async def enrich_bounded(self, loc, redis_client, semaphore):
+        async with semaphore:
+            return await self.enrich_with_weather(loc, redis_client)
+
+    async def enrich_with_weather(self, loc, redis_client):
+        lat = float(loc["latitude"])
+        lon = float(loc["longitude"])
+        key = weather_cache_key(lat, lon)
+        redis_key = f"weather:{key}"
+        s3_filename = f"weather_cache/{key}"
+
+        # redis
+        weather = await get_weather_from_redis(redis_client, redis_key)
+        if weather:
+            loc["weather"] = weather
+            return loc
+
+        # s3
+        weather = await get_weather_from_s3(s3_filename)
+        if weather:
+            loc["weather"] = weather
+            await set_weather_in_redis(redis_client, redis_key, weather)
+            return loc
+
+        # api
+        weather = await fetch_weather(lat, lon)
+        loc["weather"] = weather
+
+        await cache_weather(redis_client, redis_key, s3_filename, weather)
+        return loc
+
 
 class AsyncLocationListCreateAPIView(
     LocationQuerySetMixin,
+    WeatherEnrichmentMixin,
+    ConditionalGetMixin,
+    LeanSerializerMixin,
     async_mixins.ListModelMixin,
     async_mixins.CreateModelMixin,
     async_generics.GenericAPIView,
 ):
     permission_classes = (IsAdminOrReadOnly,)
     filter_backends = (
+        DistanceFilterBackend,
         DjangoFilterBackend,
         filters.SearchFilter,
-        filters.OrderingFilter,
+        LocationOrderingFilter,
     )
     filterset_class = LocationFilterSet
     search_fields = ("name", "description")
     ordering_fields = (
         "name",
         "view_count",
+        "unique_viewers",
         "average_rating",
         "review_count",
         "created_at",
         "is_active",
         "popularity_score",
+        "distance",
+        "trending",
     )
+    renderer_classes = (*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer)
+    lean_serializer_class = LocationListValuesSerializer
+    stream_chunk_size = 500
+    # поля, які змінюються без bump namespace: погода, флаш лічильників
+    volatile_fields = {"weather", "view_count", "unique_viewers", "popularity_score"}
 
     async def get(self, request, *args, **kwargs):
+        not_modified = await sync_to_async(self.check_not_modified)(request)
+        if not_modified is not None:
+            return not_modified
+
+        if request.accepted_renderer.format == NDJSONRenderer.format:
+            return await self.stream(request)
+
+        cache_key = await sync_to_async(make_list_cache_key)(
+            LOCATION_LIST_NAMESPACE, request, self.get_cache_variant()
+        )
+        data = await cache.aget(cache_key)
+        if data is not None:
+            return response.Response(data)
+
         queryset = await sync_to_async(self.get_queryset)()
         queryset = await sync_to_async(self.filter_queryset)(queryset)
 
+        lean_serializer = self.get_lean_serializer(
+            queryset, fields=self.get_sparse_fields()
+        )
+        if lean_serializer is not None:
+            queryset = lean_serializer.get_queryset(queryset)
+
         page = await sync_to_async(self.paginate_queryset)(queryset)
 
         redis_client = redis.Redis()
 
         if page is not None:
-            serialized_page = self.get_serializer(page, many=True).data
-
-            enriched_page = await asyncio.gather(
-                *(
-                    self.enrich_with_weather(loc, redis_client)
-                    for loc in serialized_page
-                )
+            serialized_page = self.serialize_rows(page, lean_serializer)
+            enriched_page = await self.enrich_many(serialized_page, redis_client)
+            data = self.get_paginated_response(enriched_page).data
+            since = self.get_updated_since()
+            if since is not None:
+                data["deleted"] = await sync_to_async(self.get_tombstones)(since)
+        else:
+            serialized_data = await sync_to_async(self.serialize_rows)(
+                queryset, lean_serializer
             )
-            return self.get_paginated_response(enriched_page)
+            data = await self.enrich_many(serialized_data, redis_client)
 
-        serialized_data = self.get_serializer(queryset, many=True).data
+        await cache.aset(cache_key, data, settings.CACHE_TTL)
+        return response.Response(data)
 
-        enriched_data = await asyncio.gather(
-            *(self.enrich_with_weather(loc, redis_client) for loc in serialized_data)
+    async def stream(self, request):
+        queryset = await sync_to_async(self.get_queryset)()
+        queryset = await sync_to_async(self.filter_queryset)(queryset)
+
+        lean_serializer = self.get_lean_serializer(
+            queryset, fields=self.get_sparse_fields()
         )
-        return response.Response(enriched_data)
+        if lean_serializer is not None:
+            queryset = lean_serializer.get_queryset(queryset)
+
+        return StreamingHttpResponse(
+            self.iter_ndjson(queryset, lean_serializer, self.get_updated_since()),
+            content_type=NDJSONRenderer.media_type,
+        )
+
+    def iter_ndjson(self, queryset, lean_serializer, since=None):
+        # Синхронний генератор: під WSGI StreamingHttpResponse вичитує async
+        # iterator цілком до першого байта, а sync - віддає по чанку. Тож у
+        # пам'яті лише поточний чанк. Погода - один async_to_sync на чанк.
+        renderer = NDJSONRenderer()
+        rows = queryset.iterator(chunk_size=self.stream_chunk_size)
+
+        while chunk := list(islice(rows, self.stream_chunk_size)):
+            serialized = self.serialize_rows(chunk, lean_serializer)
+            for record in async_to_sync(self.enrich_chunk)(serialized):
+                yield renderer.render_record(record)
+
+        if since is not None:
+            for location_id in self.get_tombstones(since):
+                yield renderer.render_record({"id": location_id, "deleted": True})
+
+    async def enrich_chunk(self, locs):
+        # async_to_sync може запускати кожен виклик у новому event loop,
+        # тож клієнт Redis не переживає чанк
+        redis_client = redis.Redis()
+        try:
+            return await self.enrich_many(locs, redis_client)
+        finally:
+            await redis_client.aclose()
 
     async def post(self, request, *args, **kwargs):
         return await sync_to_async(self.create)(request, *args, **kwargs)
 
+    def get_updated_since(self):
+        # викликається після filter_queryset, тож значення вже провалідоване
+        value = self.request.query_params.get("updated_since")
+        if not value:
+            return None
+        return LocationFilterSet.base_filters["updated_since"].field.clean(value)
+
+    def get_tombstones(self, since):
+        # soft-deleted локації не потрапляють у results (для staff - лише з
+        # is_active=false), тож клієнт синхронізації отримує їх id окремо
+        queryset = Location.objects.filter(is_active=False, updated_at__gte=since)
+        return [str(pk) for pk in queryset.order_by("pk").values_list("pk", flat=True)]
+
     def get_serializer_class(self):
         if self.request.method == "POST":
             return LocationCreateSerializer
         return LocationListSerializer
 
+    def get_etag_parts(self):
+        parts = (
+            LOCATION_LIST_NAMESPACE,
+            get_namespace_version(LOCATION_LIST_NAMESPACE),
+            self.get_cache_variant(),
+            request_fingerprint(self.request),
+        )
+        if self.has_volatile_fields():
+            parts += (self.get_time_bucket(),)
+        return parts
+
+    def has_volatile_fields(self):
+        fields = self.get_sparse_fields()
+        return fields is None or bool(fields & self.volatile_fields)
+
     def perform_create(self, serializer):
         super().perform_create(serializer)
+        bump_namespace_version(LOCATION_LIST_NAMESPACE)
 
-        # обгортаю у try-except щоб не фейлились тести
-        try:
-            cache.delete_pattern("*location_list*")
-        except AttributeError:
-            pass
 
-    async def enrich_with_weather(self, loc, redis_client):
-        lat = float(loc["latitude"])
-        lon = float(loc["longitude"])
-        key = f"{lat:.4f}_{lon:.4f}"
-        redis_key = f"weather:{key}"
-        s3_filename = f"weather_cache/{key}"
-
-        # redis
-        weather = await get_weather_from_redis(redis_client, redis_key)
-        if weather:
-            loc["weather"] = weather
-            return loc
-
-        # s3
-        weather = await get_weather_from_s3(s3_filename)
-        if weather:
-            loc["weather"] = weather
-            await set_weather_in_redis(redis_client, redis_key, weather)
-            return loc
+class LocationDetailAPIView(
+    LocationQuerySetMixin,
+    WeatherEnrichmentMixin,
+    ConditionalGetMixin,
+    async_mixins.RetrieveModelMixin,
+    async_mixins.UpdateModelMixin,
+    async_mixins.DestroyModelMixin,
+    async_generics.GenericAPIView,
+):
+    permission_classes = (IsAdminOrReadOnly,)
 
-        # api
-        weather = await fetch_weather(lat, lon)
-        loc["weather"] = weather
+    async def get(self, request, *args, **kwargs):
+        not_modified = await sync_to_async(self.check_not_modified)(request)
+        if not_modified is not None:
+            return not_modified
 
-        await cache_weather(redis_client, redis_key, s3_filename, weather)
-        return loc
+        # локація (кеш або БД) і погода вантажаться паралельно; якщо
+        # локація недоступна (404), погоду для неї не довантажуємо
+        weather_task = asyncio.ensure_future(self.load_weather(self.kwargs["pk"]))
+        try:
+            data = await self.load_location(request)
+        except BaseException:
+            weather_task.cancel()
+            raise
+        weather = await weather_task
+        if self.wants_weather():
+            data["weather"] = weather
+        return response.Response(data)
+
+    async def put(self, request, *args, **kwargs):
+        return await sync_to_async(self.update)(request, *args, **kwargs)
+
+    async def patch(self, request, *args, **kwargs):
+        return await sync_to_async(self.partial_update)(request, *args, **kwargs)
+
+    async def delete(self, request, *args, **kwargs):
+        return await sync_to_async(self.destroy)(request, *args, **kwargs)
+
+    async def load_location(self, request):
+        # версія namespace локації росте при зміні локації і її відгуків,
+        # варіант розділяє staff (бачить неактивні) і решту
+        cache_key = await sync_to_async(make_object_cache_key)(
+            location_namespace(self.kwargs["pk"]), request, self.get_cache_variant()
+        )
+        data = await cache.aget(cache_key)
+        if data is None:
+            instance = await sync_to_async(self.get_object)()
+            data = self.get_serializer(instance).data
+            await cache.aset(cache_key, data, settings.CACHE_TTL)
+
+        # відповідь не чекає на Redis: перегляд пишеться у фоні
+        await view_recorder.asubmit(
+            record_location_view, self.kwargs["pk"], self.get_visitor_id()
+        )
+        return dict(data)
 
+    async def load_weather(self, location_id):
+        if not self.wants_weather():
+            return None
 
-class LocationDetailAPIView(
-    LocationQuerySetMixin, generics.RetrieveUpdateDestroyAPIView
-):
-    permission_classes = (IsAdminOrReadOnly,)
+        # та сама видимість, що й у get_queryset: погоду для прихованих
+        # локацій не шукаємо
+        queryset = Location.objects.filter(pk=location_id)
+        if not self.request.user.is_staff:
+            queryset = queryset.filter(is_active=True)
+        coordinates = await queryset.values("latitude", "longitude").afirst()
+        if coordinates is None:
+            return None
 
-    def get_object(self):
-        obj = super().get_object()
-        obj.view_count += 1
-        obj.save(update_fields=["view_count"])
-        return obj
+        redis_client = redis.Redis()
+        try:
+            async with asyncio.timeout(settings.WEATHER_TIMEOUT):
+                loc = await self.enrich_with_weather(coordinates, redis_client)
+        except Exception:
+            # погода не критична: detail віддаємо і без неї
+            return None
+        finally:
+            await redis_client.aclose()
+        return loc.get("weather")
+
+    def wants_weather(self):
+        fields = self.get_sparse_fields()
+        return fields is None or "weather" in fields
+
+    def get_etag_parts(self):
+        namespace = location_namespace(self.kwargs["pk"])
+        parts = (
+            namespace,
+            get_namespace_version(namespace),
+            self.get_cache_variant(),
+            request_fingerprint(self.request),
+        )
+        if self.wants_weather():
+            parts += (self.get_time_bucket(),)
+        return parts
+
+    def get_visitor_id(self):
+        if self.request.user.is_authenticated:
+            return f"user:{self.request.user.pk}"
+        # анонім: IP + User-Agent, самі значення в Redis не потрапляють
+        raw = "|".join(
+            (
+                self.request.META.get("REMOTE_ADDR", ""),
+                self.request.META.get("HTTP_USER_AGENT", ""),
+            )
+        )
+        return hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
 
     def get_serializer_class(self):
         if self.request.method in {"PUT", "PATCH"}:
@@ -158,42 +482,256 @@ class LocationDetailAPIView(
     def perform_destroy(self, instance):
         instance.is_active = False
         instance.save(update_fields=["is_active"])
-        try:
-            cache.delete_pattern("*location_list*")
-        except AttributeError:
-            pass
+        bump_namespace_version(LOCATION_LIST_NAMESPACE)
+        bump_namespace_version(location_namespace(instance.pk))
 
     def perform_update(self, serializer):
         super().perform_update(serializer)
+        bump_namespace_version(LOCATION_LIST_NAMESPACE)
+        bump_namespace_version(location_namespace(serializer.instance.pk))
+
+
+class LocationBatchAPIView(
+    LocationQuerySetMixin, WeatherEnrichmentMixin, async_generics.GenericAPIView
+):
+    # ?ids=a,b,c: одна вибірка з анотаціями замість N запитів до detail,
+    # перегляди при цьому не рахуються
+    permission_classes = (IsAdminOrReadOnly,)
+    serializer_class = LocationRetrieveSerializer
+    max_ids = 200
+
+    async def get(self, request, *args, **kwargs):
+        ids = self.parse_ids(request)
+
+        queryset = await sync_to_async(self.get_queryset)()
+        queryset = queryset.filter(pk__in=ids)
+        locations = {
+            location.pk: location for location in await sync_to_async(list)(queryset)
+        }
+
+        found = [locations[pk] for pk in ids if pk in locations]
+        redis_client = redis.Redis()
         try:
-            cache.delete_pattern("*location_list*")
-        except AttributeError:
-            pass
+            data = await self.enrich_many(
+                self.get_serializer(found, many=True).data, redis_client
+            )
+        finally:
+            await redis_client.aclose()
+        return response.Response(
+            {
+                "results": data,
+                "not_found": [str(pk) for pk in ids if pk not in locations],
+            }
+        )
+
+    def parse_ids(self, request):
+        raw = [
+            value.strip() for value in request.query_params.get("ids", "").split(",")
+        ]
+        raw = [value for value in raw if value]
+        if not raw:
+            raise ValidationError({"ids": "This parameter is required."})
+
+        try:
+            # dict зберігає порядок запиту і прибирає дублікати
+            ids = list(dict.fromkeys(uuid.UUID(value) for value in raw))
+        except ValueError:
+            raise ValidationError({"ids": "Expected comma-separated UUIDs."})
+
+        if len(ids) > self.max_ids:
+            raise ValidationError({"ids": f"At most {self.max_ids} ids are allowed."})
+        return ids
+
+
+class LocationNearbyAPIView(generics.GenericAPIView):
+    permission_classes = (IsAdminOrReadOnly,)
+    serializer_class = LocationNearbySerializer
+    default_limit = 10
+    max_limit = 100
+
+    def get_queryset(self):
+        queryset = Location.objects.select_related("category")
+        if self.request.user.is_staff:
+            return queryset
+        return queryset.filter(is_active=True)
+
+    def get(self, request, *args, **kwargs):
+        location = self.get_object()
+        limit = self.get_limit()
+
+        neighbours = location_index.nearest(
+            float(location.latitude),
+            float(location.longitude),
+            k=limit,
+            exclude=location.pk,
+        )
+        distances = dict(neighbours)
+
+        locations = self.get_queryset().filter(is_active=True, pk__in=distances)
+        locations = sorted(locations, key=lambda loc: distances[loc.pk])
+        for loc in locations:
+            loc.distance_m = distances[loc.pk]
+
+        serializer = self.get_serializer(locations, many=True)
+        return response.Response(serializer.data)
+
+    def get_limit(self):
+        value = self.request.query_params.get("limit", self.default_limit)
+        try:
+            limit = int(value)
+        except (TypeError, ValueError):
+            raise ValidationError({"limit": ["Expected an integer."]})
+        if not 0 < limit <= self.max_limit:
+            raise ValidationError(
+                {"limit": [f"Must be between 1 and {self.max_limit}."]}
+            )
+        return limit
+
+
+class LocationPinsAPIView(ConditionalGetMixin, generics.GenericAPIView):
+    permission_classes = (IsAdminOrReadOnly,)
+    renderer_classes = (ORJSONRenderer, PinsBinaryRenderer)
+    filter_backends = (
+        DistanceFilterBackend,
+        DjangoFilterBackend,
+        filters.SearchFilter,
+    )
+    filterset_class = LocationFilterSet
+    search_fields = ("name", "description")
+
+    def get_queryset(self):
+        queryset = Location.objects.annotate_average_rating()
+        queryset = queryset.annotate_review_count()
+        queryset = queryset.annotate_popularity_score()
+
+        if self.request.user.is_staff:
+            return queryset
+        return queryset.filter(is_active=True)
+
+    def get(self, request, *args, **kwargs):
+        not_modified = self.check_not_modified(request)
+        if not_modified is not None:
+            return not_modified
+
+        queryset = self.filter_queryset(self.get_queryset()).order_by("id")
+        rows = queryset.values_list(
+            "id", "latitude", "longitude", "popularity_score", "category_id"
+        )
+        return response.Response(self.to_columns(rows))
+
+    def get_etag_parts(self):
+        return (
+            LOCATION_LIST_NAMESPACE,
+            get_namespace_version(LOCATION_LIST_NAMESPACE),
+            "staff" if self.request.user.is_staff else "public",
+            request_fingerprint(self.request),
+            # popularity_score залежить від лічильників переглядів
+            self.get_time_bucket(),
+        )
+
+    def to_columns(self, rows):
+        data = {
+            "count": 0,
+            "categories": [],
+            "id": [],
+            "latitude": [],
+            "longitude": [],
+            "popularity_score": [],
+            "category": [],
+        }
+        category_index = {}
+
+        for location_id, latitude, longitude, popularity, category_id in rows:
+            if category_id not in category_index:
+                category_index[category_id] = len(category_index)
+            data["id"].append(location_id)
+            data["latitude"].append(float(latitude))
+            data["longitude"].append(float(longitude))
+            data["popularity_score"].append(float(popularity))
+            data["category"].append(category_index[category_id])
+
+        names = dict(
+            Category.objects.filter(pk__in=category_index).values_list("id", "name")
+        )
+        data["categories"] = [
+            {"id": category_id, "name": names[category_id]}
+            for category_id in category_index
+        ]
+        data["count"] = len(data["id"])
+        return data
 
 
 class LocationExportCSVAPIView(views.APIView):
     permission_classes = (permissions.IsAuthenticated,)
+    chunk_size = 2000
 
     def get(self, request, *args, **kwargs):
-        queryset = Location.objects.all().values(
-            "id",
-            "name",
-            "description",
-            "category_id",
-            "category__name",
-            "latitude",
-            "longitude",
-            "address",
-            "is_active",
-            "view_count",
-            "created_at",
-        )
-        df = pd.DataFrame.from_records(queryset)
-
-        response = HttpResponse(content_type="text/csv")
+        queryset = Location.objects.order_by()
+        if can_copy(queryset.db):
+            content = iter_copy_csv(get_csv_queryset(queryset, copy=True))
+        else:
+            # iterator() читає чанками через server-side курсор, тож пам'ять
+            # не залежить від розміру таблиці
+            rows = get_csv_queryset(queryset).iterator(chunk_size=self.chunk_size)
+            content = iter_csv_rows(rows)
+
+        response = StreamingHttpResponse(
+            chain([CSV_HEADER], content), content_type="text/csv"
+        )
         response["Content-Disposition"] = "attachment; filename=locations.csv"
+        return response
+
 
-        response.write("\ufeff")
-        df.to_csv(path_or_buf=response, index=False)
+class LocationExportParquetAPIView(views.APIView):
+    permission_classes = (permissions.IsAuthenticated,)
 
+    def get(self, request, *args, **kwargs):
+        filterset = build_filterset(request.query_params, aggregates=True)
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+
+        rows = get_parquet_rows(filterset)
+        response = StreamingHttpResponse(
+            iter_parquet(iter_chunks(rows, settings.EXPORT_ROW_GROUP_SIZE)),
+            content_type="application/vnd.apache.parquet",
+        )
+        response["Content-Disposition"] = "attachment; filename=locations.parquet"
         return response
+
+
+class LocationExportJobCreateAPIView(generics.CreateAPIView):
+    # файл будує run_export_worker, веб-воркер лише ставить задачу в чергу
+    permission_classes = (permissions.IsAuthenticated,)
+    serializer_class = ExportJobSerializer
+
+    def create(self, request, *args, **kwargs):
+        response = super().create(request, *args, **kwargs)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return response
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+
+class LocationExportJobDetailAPIView(generics.RetrieveAPIView):
+    permission_classes = (permissions.IsAuthenticated,)
+    serializer_class = ExportJobSerializer
+
+    def get_queryset(self):
+        if self.request.user.is_staff:
+            return ExportJob.objects.all()
+        return ExportJob.objects.filter(user=self.request.user)
+
+
+class LocationImportAPIView(generics.GenericAPIView):
+    # те саме, що й import_locations, для невеликих наборів через адмінку
+    permission_classes = (permissions.IsAdminUser,)
+    serializer_class = LocationImportSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        read = IMPORT_READERS[serializer.validated_data["format"]]
+        report = LocationImporter().run(read(serializer.validated_data["file"]))
+        return response.Response(report)
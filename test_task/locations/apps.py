@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class LocationsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "test_task.locations"
+
+    def ready(self):
+        from test_task.locations import signals  # noqa: F401
@@ -0,0 +1,334 @@
+import logging
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+from django_redis import get_redis_connection
+
+from test_task.locations.models import Location, LocationActivity
+
+logger = logging.getLogger(__name__)
+
+VIEW_COUNTS_KEY = "location:view_counts"
+ACTIVITY_KINDS = ("views", "reviews")
+
+
+def get_redis_client():
+    try:
+        return get_redis_connection("default")
+    except NotImplementedError:
+        return None
+
+
+def bucket_start(moment):
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def activity_key(kind, bucket):
+    return f"location:activity:{kind}:{bucket:%Y%m%d%H}"
+
+
+# Перегляди detail не пишуться в рядок на кожен GET: лічильники
+# накопичуються в Redis hash (HINCRBY) і раз на інтервал застосовуються
+# одним UPDATE ... SET view_count = view_count + delta.
+# Якщо кеш не django-redis (тести, локальна розробка), буфер живе в пам'яті
+# процесу і скидається сам, коли минув інтервал.
+class ViewCounter:
+
+    def __init__(self, flush_interval=60, batch_size=500):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._buffer = Counter()
+        self._flushed_at = time.monotonic()
+
+    def record(self, location_id):
+        redis_client = get_redis_client()
+        if redis_client is not None:
+            redis_client.hincrby(VIEW_COUNTS_KEY, str(location_id), 1)
+            return
+
+        with self._lock:
+            self._buffer[location_id] += 1
+            due = time.monotonic() - self._flushed_at > self.flush_interval
+        if due:
+            self.flush()
+
+    def drain(self):
+        redis_client = get_redis_client()
+        if redis_client is None:
+            with self._lock:
+                deltas, self._buffer = dict(self._buffer), Counter()
+                self._flushed_at = time.monotonic()
+            return deltas
+
+        # HGETALL і DEL в одній транзакції, щоб не загубити інкременти між ними
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.hgetall(VIEW_COUNTS_KEY)
+        pipe.delete(VIEW_COUNTS_KEY)
+        counts, _ = pipe.execute()
+        return {uuid.UUID(key.decode()): int(value) for key, value in counts.items()}
+
+    def restore(self, deltas):
+        redis_client = get_redis_client()
+        if redis_client is None:
+            with self._lock:
+                self._buffer.update(deltas)
+            return
+
+        pipe = redis_client.pipeline(transaction=False)
+        for location_id, delta in deltas.items():
+            pipe.hincrby(VIEW_COUNTS_KEY, str(location_id), delta)
+        pipe.execute()
+
+    def flush(self):
+        deltas = self.drain()
+        updated = 0
+        items = list(deltas.items())
+        try:
+            for start in range(0, len(items), self.batch_size):
+                updated += self.apply(items[start : start + self.batch_size])
+        except Exception:
+            # повертаємо незастосовані дельти, наступний flush спробує ще раз
+            self.restore(dict(items[start:]))
+            raise
+        return updated
+
+    def apply(self, items):
+        delta = Case(
+            *(When(pk=location_id, then=Value(count)) for location_id, count in items),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        # updated_at не чіпаємо: лічильники не є змінами для updated_since,
+        # інакше кожен flush робив би популярні локації "зміненими"
+        return Location.objects.filter(pk__in=[pk for pk, _ in items]).update(
+            view_count=F("view_count") + delta
+        )
+
+
+# Годинні лічильники активності для trending: Redis hash на кожну годину і
+# вид активності з TTL, тож в Redis живе лише останнє вікно. rollup()
+# переписує абсолютні значення останніх годин у LocationActivity, тому його
+# можна запускати як завгодно часто.
+class ActivityCounter:
+
+    def __init__(self, bucket_ttl=48 * 3600):
+        self.bucket_ttl = bucket_ttl
+        self._lock = threading.Lock()
+        # (kind, bucket) -> Counter(location_id)
+        self._buckets = defaultdict(Counter)
+
+    def record(self, location_id, kind, moment=None):
+        bucket = bucket_start(moment or timezone.now())
+        redis_client = get_redis_client()
+        if redis_client is None:
+            with self._lock:
+                if (kind, bucket) not in self._buckets:
+                    self.prune(bucket)
+                self._buckets[kind, bucket][location_id] += 1
+            return
+
+        key = activity_key(kind, bucket)
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.hincrby(key, str(location_id), 1)
+        pipe.expire(key, self.bucket_ttl)
+        pipe.execute()
+
+    def prune(self, current):
+        oldest = current - timedelta(seconds=self.bucket_ttl)
+        for key in [key for key in self._buckets if key[1] < oldest]:
+            del self._buckets[key]
+
+    def get_bucket(self, kind, bucket):
+        redis_client = get_redis_client()
+        if redis_client is None:
+            with self._lock:
+                return dict(self._buckets.get((kind, bucket), {}))
+
+        counts = redis_client.hgetall(activity_key(kind, bucket))
+        return {uuid.UUID(key.decode()): int(value) for key, value in counts.items()}
+
+    def rollup(self, hours=2, now=None):
+        current = bucket_start(now or timezone.now())
+        rows = defaultdict(dict)
+        for offset in range(hours):
+            bucket = current - timedelta(hours=offset)
+            for kind in ACTIVITY_KINDS:
+                for location_id, count in self.get_bucket(kind, bucket).items():
+                    rows[location_id, bucket][kind] = count
+
+        # локацію могли видалити, поки бакет жив у Redis
+        existing = set(
+            Location.objects.filter(
+                pk__in={location_id for location_id, _ in rows}
+            ).values_list("pk", flat=True)
+        )
+        activity = [
+            LocationActivity(
+                location_id=location_id,
+                bucket=bucket,
+                views=counts.get("views", 0),
+                reviews=counts.get("reviews", 0),
+            )
+            for (location_id, bucket), counts in rows.items()
+            if location_id in existing
+        ]
+        LocationActivity.objects.bulk_create(
+            activity,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=("location", "bucket"),
+            update_fields=("views", "reviews"),
+        )
+        return len(activity)
+
+
+# Унікальні відвідувачі через HyperLogLog: PFADD у денний ключ (з TTL) і
+# множина локацій, яких торкались за день. persist() зливає денні HLL у
+# довічний (PFMERGE - об'єднання, тож повторний запуск безпечний) і пише
+# PFCOUNT у Location.unique_viewers. HLL займає до ~12 КБ на ключ незалежно
+# від трафіку. Fallback без Redis тримає множини і годиться лише для dev.
+class UniqueViewerCounter:
+
+    def __init__(self, day_ttl=3 * 24 * 3600, batch_size=500):
+        self.day_ttl = day_ttl
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        # (location_id, day | None) -> set(visitor_id)
+        self._visitors = defaultdict(set)
+
+    def lifetime_key(self, location_id):
+        return f"location:visitors:{location_id}"
+
+    def day_key(self, location_id, day):
+        return f"location:visitors:{location_id}:{day:%Y%m%d}"
+
+    def touched_key(self, day):
+        return f"location:visitors:touched:{day:%Y%m%d}"
+
+    def record(self, location_id, visitor_id, moment=None):
+        day = (moment or timezone.now()).date()
+        redis_client = get_redis_client()
+        if redis_client is None:
+            with self._lock:
+                self._visitors[location_id, day].add(visitor_id)
+            return
+
+        day_key = self.day_key(location_id, day)
+        touched_key = self.touched_key(day)
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.pfadd(day_key, visitor_id)
+        pipe.expire(day_key, self.day_ttl)
+        pipe.sadd(touched_key, str(location_id))
+        pipe.expire(touched_key, self.day_ttl)
+        pipe.execute()
+
+    def merge(self, day):
+        redis_client = get_redis_client()
+        if redis_client is None:
+            with self._lock:
+                touched = [key for key in self._visitors if key[1] == day]
+                for location_id, _ in touched:
+                    self._visitors[location_id, None] |= self._visitors.pop(
+                        (location_id, day)
+                    )
+            return {location_id for location_id, _ in touched}
+
+        touched = {
+            uuid.UUID(value.decode())
+            for value in redis_client.smembers(self.touched_key(day))
+        }
+        pipe = redis_client.pipeline(transaction=False)
+        for location_id in touched:
+            pipe.pfmerge(self.lifetime_key(location_id), self.day_key(location_id, day))
+        pipe.execute()
+        return touched
+
+    def count(self, location_ids):
+        redis_client = get_redis_client()
+        if redis_client is None:
+            with self._lock:
+                return {
+                    location_id: len(self._visitors.get((location_id, None), ()))
+                    for location_id in location_ids
+                }
+
+        pipe = redis_client.pipeline(transaction=False)
+        for location_id in location_ids:
+            pipe.pfcount(self.lifetime_key(location_id))
+        return dict(zip(location_ids, pipe.execute()))
+
+    def persist(self, days=2, now=None):
+        today = (now or timezone.now()).date()
+        location_ids = set()
+        for offset in range(days):
+            location_ids |= self.merge(today - timedelta(days=offset))
+
+        counts = self.count(list(location_ids))
+        locations = [
+            Location(pk=location_id, unique_viewers=count)
+            for location_id, count in counts.items()
+        ]
+        # bulk_update по неіснуючих pk нічого не оновлює
+        Location.objects.bulk_update(
+            locations, ("unique_viewers",), batch_size=self.batch_size
+        )
+        return len(locations)
+
+
+view_counter = ViewCounter(flush_interval=settings.VIEW_COUNT_FLUSH_INTERVAL)
+activity_counter = ActivityCounter(bucket_ttl=settings.ACTIVITY_BUCKET_TTL)
+unique_viewer_counter = UniqueViewerCounter()
+
+
+# Запис перегляду - три звернення до Redis, і detail не має на них чекати.
+# Задачі йдуть у пул потоків процесу: під WSGI event loop запиту
+# закривається разом із запитом, тож asyncio-таска там не доживе. Пул
+# тримає посилання на задачі сам, помилки лише логуються.
+class BackgroundRecorder:
+
+    def __init__(self, max_workers=4):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="view-recorder"
+        )
+
+    def submit(self, func, *args):
+        if not settings.RECORD_VIEWS_IN_BACKGROUND:
+            func(*args)
+            return None
+        return self._executor.submit(self.run, func, *args)
+
+    async def asubmit(self, func, *args):
+        # з async-коду: синхронний запис (у т.ч. flush у БД) не можна
+        # виконувати прямо в event loop
+        if not settings.RECORD_VIEWS_IN_BACKGROUND:
+            await sync_to_async(func)(*args)
+            return None
+        return self.submit(func, *args)
+
+    def run(self, func, *args):
+        try:
+            func(*args)
+        except Exception:
+            logger.exception("Failed to record location view")
+        finally:
+            # ViewCounter без Redis може сам зробити flush у БД
+            close_old_connections()
+
+
+def record_location_view(location_id, visitor_id):
+    view_counter.record(location_id)
+    activity_counter.record(location_id, "views")
+    unique_viewer_counter.record(location_id, visitor_id)
+
+
+view_recorder = BackgroundRecorder(max_workers=settings.VIEW_RECORDER_WORKERS)
@@ -0,0 +1,462 @@
+import csv
+import queue
+import threading
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from itertools import islice
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Case, CharField, F, Func, TextField, Value, When
+from django.db.models.functions import NullIf
+from django.utils import timezone
+
+from test_task.core.cloudflare_r2_client import s3_client
+from test_task.locations.api.v1.filters import LocationFilterSet
+from test_task.locations.models import ExportJob, Location
+
+EXPORT_COLUMNS = (
+    "id",
+    "name",
+    "description",
+    "category_id",
+    "category__name",
+    "latitude",
+    "longitude",
+    "address",
+    "is_active",
+    "view_count",
+    "created_at",
+    "updated_at",
+)
+
+# колонка -> тип Arrow; порядок збігається з values_list()
+PARQUET_COLUMNS = (
+    ("id", pa.string()),
+    ("name", pa.string()),
+    ("description", pa.string()),
+    ("category_id", pa.string()),
+    ("category__name", pa.string()),
+    ("latitude", pa.decimal128(9, 6)),
+    ("longitude", pa.decimal128(9, 6)),
+    ("address", pa.string()),
+    ("is_active", pa.bool_()),
+    ("view_count", pa.int64()),
+    ("unique_viewers", pa.int64()),
+    ("average_rating", pa.float64()),
+    ("review_count", pa.int64()),
+    ("popularity_score", pa.float64()),
+    ("created_at", pa.timestamp("us", tz="UTC")),
+    ("updated_at", pa.timestamp("us", tz="UTC")),
+)
+PARQUET_SCHEMA = pa.schema(
+    [(name.replace("__", "_"), type_) for name, type_ in PARQUET_COLUMNS]
+)
+PARQUET_CONVERTERS = {"id": str, "category_id": str}
+
+
+class Echo:
+    # csv.writer пише рядок у "файл", а ми одразу забираємо його
+    def write(self, value):
+        return value
+
+
+class CSVLineWriter:
+    # Рядки закінчуються "\n", як у COPY ... WITH (FORMAT csv). Але csv
+    # бере поле в лапки лише через символи з lineterminator, тож пишемо з
+    # "\r\n" (у лапки потрапляють і голий \r, і \n, як у COPY) і вже
+    # потім міняємо закінчення рядка.
+    def __init__(self):
+        self.writer = csv.writer(Echo(), lineterminator="\r\n")
+
+    def writerow(self, row):
+        return self.writer.writerow(row)[:-2] + "\n"
+
+
+def csv_writer():
+    return CSVLineWriter()
+
+
+CSV_HEADER = "\ufeff" + csv_writer().writerow(EXPORT_COLUMNS)
+
+# Формат значень однаковий для COPY і Python-шляху: True/False та ISO 8601
+# в UTC з мікросекундами. Порожній рядок пишеться як порожнє поле (COPY
+# інакше взяв би його в лапки, щоб відрізнити від NULL).
+CSV_TEXT_COLUMNS = {"name", "description", "category__name", "address"}
+CSV_BOOLEAN_COLUMNS = {"is_active"}
+CSV_DATETIME_COLUMNS = {"created_at", "updated_at"}
+CSV_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+
+class CSVTimestamp(Func):
+    template = (
+        "to_char(%(expressions)s AT TIME ZONE 'UTC', "
+        '\'YYYY-MM-DD"T"HH24:MI:SS.US"Z"\')'
+    )
+    output_field = CharField()
+
+
+def copy_expression(name):
+    if name in CSV_TEXT_COLUMNS:
+        return NullIf(F(name), Value(""), output_field=TextField())
+    if name in CSV_BOOLEAN_COLUMNS:
+        return Case(
+            When(**{name: True}, then=Value("True")),
+            default=Value("False"),
+            output_field=CharField(),
+        )
+    if name in CSV_DATETIME_COLUMNS:
+        return CSVTimestamp(F(name))
+    return F(name)
+
+
+def format_csv_value(value):
+    if isinstance(value, datetime):
+        return value.astimezone(dt_timezone.utc).strftime(CSV_DATETIME_FORMAT)
+    return value
+
+
+def iter_csv_rows(rows):
+    writer = csv_writer()
+    for row in rows:
+        yield writer.writerow([format_csv_value(value) for value in row])
+
+
+def get_csv_queryset(queryset, copy=False):
+    # для COPY форматування робить сам SELECT
+    if copy:
+        return queryset.values_list(*(copy_expression(name) for name in EXPORT_COLUMNS))
+    return queryset.values_list(*EXPORT_COLUMNS)
+
+
+def build_filterset(filters, aggregates=False):
+    queryset = Location.objects.order_by()
+    if aggregates:
+        queryset = queryset.annotate_average_rating()
+        queryset = queryset.annotate_review_count()
+        queryset = queryset.annotate_popularity_score()
+    elif {"average_rating_min", "average_rating_max"} & set(filters):
+        queryset = queryset.annotate_average_rating()
+    return LocationFilterSet(data=filters, queryset=queryset)
+
+
+class BufferSink:
+    # file-like для ParquetWriter: накопичує байти, поки їх не заберуть
+    closed = False
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.position = 0
+
+    def write(self, data):
+        self.buffer += data
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+
+def iter_chunks(rows, size):
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def to_record_batch(rows):
+    arrays = []
+    for (name, type_), values in zip(PARQUET_COLUMNS, zip(*rows)):
+        convert = PARQUET_CONVERTERS.get(name)
+        if convert is not None:
+            values = [convert(value) for value in values]
+        arrays.append(pa.array(values, type=type_))
+    return pa.RecordBatch.from_arrays(arrays, schema=PARQUET_SCHEMA)
+
+
+def iter_parquet(chunks):
+    # кожен чанк - окрема row group; байти віддаємо одразу після запису,
+    # footer - в останньому шматку
+    sink = BufferSink()
+    with pq.ParquetWriter(
+        pa.PythonFile(sink, mode="w"), PARQUET_SCHEMA, compression="zstd"
+    ) as writer:
+        for chunk in chunks:
+            writer.write_batch(to_record_batch(chunk))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def get_parquet_rows(filterset):
+    return filterset.qs.values_list(*(name for name, _ in PARQUET_COLUMNS)).iterator(
+        chunk_size=settings.EXPORT_ROW_GROUP_SIZE
+    )
+
+
+def can_copy(using):
+    if not settings.EXPORT_USE_COPY:
+        return False
+    connection = connections[using]
+    return (
+        connection.vendor == "postgresql" and connection.Database.__name__ == "psycopg2"
+    )
+
+
+def get_raw_connection(using):
+    connection = connections[using]
+    connection.ensure_connection()
+    return connection.connection
+
+
+def copy_csv(raw_connection, queryset, file):
+    # SQL будує ORM (ті самі фільтри й колонки), а рядки форматує сам
+    # Postgres. COPY не приймає параметрів, тож підставляємо їх mogrify
+    sql, params = queryset.query.sql_with_params()
+    with raw_connection.cursor() as cursor:
+        query = cursor.mogrify(sql, params).decode()
+        cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT csv)", file)
+        return cursor.rowcount
+
+
+class CopyCancelled(Exception):
+    pass
+
+
+class QueueWriter:
+    # file-like для copy_expert: склеює рядки COPY у шматки і передає їх
+    # через обмежену чергу, тож повільний клієнт гальмує COPY, а не пам'ять
+
+    def __init__(self, chunks, cancelled, chunk_size):
+        self.chunks = chunks
+        self.cancelled = cancelled
+        self.chunk_size = chunk_size
+        self.buffer = bytearray()
+
+    def write(self, data):
+        self.buffer += data
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.put(bytes(self.buffer))
+            self.buffer.clear()
+
+    def put(self, item):
+        while not self.cancelled.is_set():
+            try:
+                self.chunks.put(item, timeout=1)
+                return
+            except queue.Full:
+                pass
+        raise CopyCancelled
+
+
+def iter_copy_csv(queryset):
+    # copy_expert сам штовхає дані у файл, тож COPY виконується в окремому
+    # потоці, а генератор віддає готові шматки. З'єднання те саме, що й у
+    # запиту: поки генератор чекає на чергу, воно більше ніким не зайняте
+    raw_connection = get_raw_connection(queryset.db)
+    chunks = queue.Queue(maxsize=8)
+    cancelled = threading.Event()
+    done = object()
+
+    def produce():
+        writer = QueueWriter(chunks, cancelled, settings.EXPORT_COPY_CHUNK_SIZE)
+        try:
+            copy_csv(raw_connection, queryset, writer)
+            writer.flush()
+            writer.put(done)
+        except CopyCancelled:
+            pass
+        except Exception as exc:
+            try:
+                writer.put(exc)
+            except CopyCancelled:
+                pass
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    finished = False
+    try:
+        while (item := chunks.get()) is not done:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+        finished = True
+    finally:
+        cancelled.set()
+        thread.join()
+        if not finished:
+            # перерваний COPY лишає з'єднання в невизначеному стані
+            connections[queryset.db].close()
+
+
+class MultipartUpload:
+    # Буферизує байти до part_size і вантажить їх частинами, тож у пам'яті
+    # не більше однієї частини. Якщо всередині with щось впало, upload
+    # скасовується, щоб у bucket не лишалось незавершених частин.
+
+    def __init__(self, key, content_type, part_size):
+        self.key = key
+        self.content_type = content_type
+        self.part_size = part_size
+        self.buffer = bytearray()
+        self.parts = []
+        self.upload_id = None
+
+    def __enter__(self):
+        response = s3_client.create_multipart_upload(
+            Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+            Key=self.key,
+            ContentType=self.content_type,
+        )
+        self.upload_id = response["UploadId"]
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is not None:
+            s3_client.abort_multipart_upload(
+                Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+                Key=self.key,
+                UploadId=self.upload_id,
+            )
+            return False
+
+        if self.buffer or not self.parts:
+            self.upload_part()
+        s3_client.complete_multipart_upload(
+            Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+            Key=self.key,
+            UploadId=self.upload_id,
+            MultipartUpload={"Parts": self.parts},
+        )
+        return False
+
+    def write(self, data):
+        self.buffer += data
+        if len(self.buffer) >= self.part_size:
+            self.upload_part()
+
+    def upload_part(self):
+        number = len(self.parts) + 1
+        response = s3_client.upload_part(
+            Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=number,
+            Body=bytes(self.buffer),
+        )
+        self.parts.append({"ETag": response["ETag"], "PartNumber": number})
+        self.buffer.clear()
+
+
+def write_csv(job, upload):
+    filterset = build_filterset(job.filters)
+    if not filterset.is_valid():
+        raise ValueError(f"Invalid filters: {dict(filterset.errors)}")
+
+    upload.write(CSV_HEADER.encode())
+    using = filterset.qs.db
+    if can_copy(using):
+        queryset = get_csv_queryset(filterset.qs, copy=True)
+        return copy_csv(get_raw_connection(using), queryset, upload)
+
+    rows = get_csv_queryset(filterset.qs).iterator(chunk_size=2000)
+    count = 0
+    for line in iter_csv_rows(rows):
+        upload.write(line.encode())
+        count += 1
+    return count
+
+
+def write_parquet(job, upload):
+    filterset = build_filterset(job.filters, aggregates=True)
+    if not filterset.is_valid():
+        raise ValueError(f"Invalid filters: {dict(filterset.errors)}")
+
+    count = 0
+
+    def counted(chunks):
+        nonlocal count
+        for chunk in chunks:
+            count += len(chunk)
+            yield chunk
+
+    rows = get_parquet_rows(filterset)
+    for data in iter_parquet(
+        counted(iter_chunks(rows, settings.EXPORT_ROW_GROUP_SIZE))
+    ):
+        upload.write(data)
+    return count
+
+
+EXPORT_WRITERS = {
+    ExportJob.Format.CSV: ("csv", "text/csv", write_csv),
+    ExportJob.Format.PARQUET: (
+        "parquet",
+        "application/vnd.apache.parquet",
+        write_parquet,
+    ),
+}
+
+
+def run_export(job):
+    extension, content_type, write = EXPORT_WRITERS[job.format]
+    key = f"exports/locations/{job.id}.{extension}"
+    with MultipartUpload(key, content_type, settings.EXPORT_PART_SIZE) as upload:
+        row_count = write(job, upload)
+    return key, row_count
+
+
+def claim_next_job():
+    # skip_locked: кілька воркерів розбирають чергу без блокувань один одного
+    with transaction.atomic():
+        job = (
+            ExportJob.objects.select_for_update(skip_locked=True)
+            .filter(status=ExportJob.Status.PENDING)
+            .order_by("created_at")
+            .first()
+        )
+        if job is None:
+            return None
+
+        job.status = ExportJob.Status.RUNNING
+        job.started_at = timezone.now()
+        job.save(update_fields=["status", "started_at"])
+    return job
+
+
+def process_job(job):
+    try:
+        job.object_key, job.row_count = run_export(job)
+    except Exception as exc:
+        job.status = ExportJob.Status.FAILED
+        job.error = str(exc) or exc.__class__.__name__
+    else:
+        job.status = ExportJob.Status.DONE
+    job.finished_at = timezone.now()
+    job.save(
+        update_fields=["status", "object_key", "row_count", "error", "finished_at"]
+    )
+    return job
+
+
+def get_download_url(job):
+    return s3_client.generate_presigned_url(
+        "get_object",
+        Params={"Bucket": settings.AWS_STORAGE_BUCKET_NAME, "Key": job.object_key},
+        ExpiresIn=settings.EXPORT_URL_EXPIRES,
+    )
@@ -0,0 +1,168 @@
+import orjson
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+from test_task.core.cache import LOCATION_LIST_NAMESPACE, bump_namespace_version
+from test_task.core.imports import BatchImporter, read_csv, read_ndjson
+from test_task.locations.models import Category, Location
+from test_task.locations.spatial import location_index
+
+
+def read_geojson(file):
+    # FeatureCollection - один JSON-документ, тож він читається цілком;
+    # для великих наборів краще NDJSON
+    collection = orjson.loads(file.read())
+    for feature in collection.get("features", ()):
+        properties = dict(feature.get("properties") or {})
+        geometry = feature.get("geometry") or {}
+        if geometry.get("type") == "Point":
+            longitude, latitude, *_ = geometry.get("coordinates") or (None, None)
+            properties.update(latitude=latitude, longitude=longitude)
+        yield properties
+
+
+IMPORT_READERS = {
+    "csv": read_csv,
+    "ndjson": read_ndjson,
+    "geojson": read_geojson,
+}
+
+
+class LocationImportRowSerializer(serializers.Serializer):
+    # без UniqueValidator: унікальність перевіряється пачкою, а не запитом
+    # на кожен рядок. Категорія - за назвою
+    name = serializers.CharField(max_length=255)
+    description = serializers.CharField(max_length=5000, allow_blank=True, default="")
+    category = serializers.CharField(max_length=255)
+    latitude = serializers.DecimalField(
+        max_digits=9,
+        decimal_places=6,
+        min_value=-90,
+        max_value=90,
+    )
+    longitude = serializers.DecimalField(
+        max_digits=9,
+        decimal_places=6,
+        min_value=-180,
+        max_value=180,
+    )
+    address = serializers.CharField(max_length=255)
+
+
+class LocationImporter(BatchImporter):
+    # На пачку - кілька запитів на категорії та унікальність і один
+    # bulk_create. Дублікати всередині файлу ловляться множинами вже
+    # побачених address і координат.
+    row_serializer_class = LocationImportRowSerializer
+
+    def __init__(self, batch_size=None, max_errors=None):
+        super().__init__(batch_size, max_errors)
+        self.categories = {}
+        self.seen_addresses = set()
+        self.seen_points = set()
+        self.created = 0
+
+    def finish(self):
+        if self.created:
+            # bulk_create не шле post_save: індекс перебудуємо цілком
+            location_index.invalidate()
+            bump_namespace_version(LOCATION_LIST_NAMESPACE)
+
+    def get_report(self):
+        return {"created": self.created, **super().get_report()}
+
+    def import_batch(self, valid):
+        self.load_categories({data["category"] for _, data in valid})
+        taken_addresses, taken_points = self.get_taken(data for _, data in valid)
+
+        locations = []
+        for row_number, data in valid:
+            errors = self.check_row(data, taken_addresses, taken_points)
+            if errors:
+                self.add_error(row_number, errors)
+                continue
+
+            self.seen_addresses.add(data["address"])
+            self.seen_points.add((data["latitude"], data["longitude"]))
+            locations.append(
+                (
+                    row_number,
+                    Location(
+                        name=data["name"],
+                        description=data["description"],
+                        category_id=self.categories[data["category"]],
+                        latitude=data["latitude"],
+                        longitude=data["longitude"],
+                        address=data["address"],
+                    ),
+                )
+            )
+        self.insert(locations)
+
+    def load_categories(self, names):
+        missing = names - set(self.categories)
+        if missing:
+            self.categories.update(
+                Category.objects.filter(name__in=missing).values_list("name", "id")
+            )
+
+    def get_taken(self, rows):
+        rows = list(rows)
+        addresses = {data["address"] for data in rows}
+        latitudes = {data["latitude"] for data in rows}
+        longitudes = {data["longitude"] for data in rows}
+
+        taken_addresses = set(
+            Location.objects.filter(address__in=addresses).values_list(
+                "address", flat=True
+            )
+        )
+        # пари координат фільтруємо в Python: IN по двох колонках окремо
+        # замість OR на тисячу умов
+        taken_points = set(
+            Location.objects.filter(
+                latitude__in=latitudes, longitude__in=longitudes
+            ).values_list("latitude", "longitude")
+        )
+        return taken_addresses, taken_points
+
+    def check_row(self, data, taken_addresses, taken_points):
+        errors = {}
+        if data["category"] not in self.categories:
+            errors["category"] = [f"Unknown category `{data['category']}`."]
+
+        address = data["address"]
+        if address in taken_addresses or address in self.seen_addresses:
+            errors["address"] = ["Location with this address already exists."]
+
+        point = (data["latitude"], data["longitude"])
+        if point in taken_points or point in self.seen_points:
+            errors["non_field_errors"] = [
+                "Location with these coordinates already exists."
+            ]
+        return errors
+
+    def insert(self, locations):
+        if not locations:
+            return
+        try:
+            with transaction.atomic():
+                Location.objects.bulk_create(
+                    [location for _, location in locations],
+                    batch_size=self.batch_size,
+                )
+            self.created += len(locations)
+            return
+        except IntegrityError:
+            pass
+
+        # конфлікт з паралельним записом: повторюємо по рядку з savepoint,
+        # щоб відкинути лише винні рядки
+        for row_number, location in locations:
+            try:
+                with transaction.atomic():
+                    location.save(force_insert=True)
+            except IntegrityError as exc:
+                self.add_error(row_number, {"non_field_errors": [str(exc)]})
+            else:
+                self.created += 1
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from test_task.locations.counters import view_counter
+
+
+class Command(BaseCommand):
+    help = "Applies buffered location view counts to the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Keep running and flush every N seconds.",
+        )
+
+    def handle(self, *args, interval, **options):
+        while True:
+            updated = view_counter.flush()
+            self.stdout.write(f"Flushed view counts for {updated} locations")
+            if not interval:
+                return
+            time.sleep(interval)
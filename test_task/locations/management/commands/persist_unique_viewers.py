@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from test_task.locations.counters import unique_viewer_counter
+
+
+class Command(BaseCommand):
+    help = "Merges daily unique-visitor HyperLogLogs and stores the estimates."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=2,
+            help="How many recent days to merge.",
+        )
+
+    def handle(self, *args, days, **options):
+        updated = unique_viewer_counter.persist(days=days)
+        self.stdout.write(f"Updated unique viewers for {updated} locations")
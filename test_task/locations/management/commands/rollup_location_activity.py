@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from test_task.locations.counters import activity_counter
+from test_task.locations.models import LocationActivity
+
+
+class Command(BaseCommand):
+    help = "Copies hourly location activity from Redis into LocationActivity."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hours",
+            type=int,
+            default=2,
+            help="How many recent hourly buckets to roll up.",
+        )
+
+    def handle(self, *args, hours, **options):
+        rows = activity_counter.rollup(hours=hours)
+        self.stdout.write(f"Rolled up {rows} activity rows")
+
+        oldest = timezone.now() - timedelta(days=settings.ACTIVITY_RETENTION_DAYS)
+        deleted, _ = LocationActivity.objects.filter(bucket__lt=oldest).delete()
+        if deleted:
+            self.stdout.write(f"Deleted {deleted} expired activity rows")
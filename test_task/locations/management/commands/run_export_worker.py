@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from test_task.locations.exports import claim_next_job, process_job
+
+
+class Command(BaseCommand):
+    help = "Processes pending location export jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process pending jobs and exit instead of polling.",
+        )
+        parser.add_argument("--poll-interval", type=float, default=5)
+
+    def handle(self, *args, once, poll_interval, **options):
+        while True:
+            job = claim_next_job()
+            if job is None:
+                if once:
+                    return
+                time.sleep(poll_interval)
+                continue
+
+            job = process_job(job)
+            self.stdout.write(f"Export {job.id}: {job.status} ({job.row_count} rows)")
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:19
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("locations", "0004_location_locations_l_is_acti_9f2958_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LocationActivity",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("bucket", models.DateTimeField()),
+                ("views", models.PositiveIntegerField(default=0)),
+                ("reviews", models.PositiveIntegerField(default=0)),
+                (
+                    "location",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="activity",
+                        to="locations.location",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Location activity",
+                "indexes": [
+                    models.Index(
+                        fields=["bucket"], name="locations_l_bucket_f0f02d_idx"
+                    )
+                ],
+                "unique_together": {("location", "bucket")},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("locations", "0005_locationactivity"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="location",
+            name="unique_viewers",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("locations", "0007_exportjob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exportjob",
+            name="format",
+            field=models.CharField(
+                choices=[("csv", "CSV"), ("parquet", "Parquet")],
+                default="csv",
+                max_length=16,
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("locations", "0008_exportjob_format"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="location",
+            index=models.Index(
+                fields=["updated_at"], name="locations_l_updated_fdc0af_idx"
+            ),
+        ),
+    ]
@@ -1,15 +1,42 @@
+import math
+
+from django.conf import settings
 from django.core.validators import (
     MaxLengthValidator,
     MinValueValidator,
     MaxValueValidator,
 )
 from django.db import models
-from django.db.models import Avg, Count, F
+from django.db.models import (
+    Avg,
+    Count,
+    ExpressionWrapper,
+    F,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+)
 from django.db.models.fields import FloatField
-from django.db.models.functions import Coalesce, Round
+from django.db.models.functions import (
+    ASin,
+    Cast,
+    Coalesce,
+    Cos,
+    Least,
+    NullIf,
+    Power,
+    Radians,
+    Round,
+    Sin,
+    Sqrt,
+)
 
 from test_task.core.models import UUIDModel, TimestampedModel
 
+EARTH_RADIUS_M = 6_371_008.8
+
 
 class Category(UUIDModel, TimestampedModel):
     name = models.CharField(max_length=100, unique=True)
@@ -39,13 +66,17 @@ class LocationQuerySet(models.QuerySet):
         reviews_weight = 0.3
         views_weight = 0.1
 
+        # унікальні відвідувачі, коли їх уже пораховано; до першого
+        # persist_unique_viewers (у т.ч. для старих локацій) - сирі перегляди
+        views = Coalesce(NullIf("unique_viewers", 0), "view_count")
+
         return self.annotate(
             popularity_score=Round(
                 Coalesce(
                     (
                         F("average_rating") * rating_weight
                         + F("review_count") * reviews_weight
-                        + F("view_count") * views_weight
+                        + views * views_weight
                     ),
                     0,
                     output_field=FloatField(),
@@ -54,6 +85,69 @@ class LocationQuerySet(models.QuerySet):
             )
         )
 
+    def annotate_trending_score(self, since):
+        views_weight = 1
+        reviews_weight = 10
+
+        # сума годинних бакетів за вікно, без сирих подій
+        activity = (
+            LocationActivity.objects.filter(location=OuterRef("pk"), bucket__gte=since)
+            .order_by()
+            .values("location")
+            .annotate(
+                score=Sum(F("views") * views_weight + F("reviews") * reviews_weight)
+            )
+            .values("score")
+        )
+        return self.annotate(
+            trending_score=Coalesce(Subquery(activity), 0, output_field=IntegerField())
+        )
+
+    def within_bounding_box(self, latitude, longitude, radius_m):
+        # грубий префільтр по індексу (latitude, longitude), щоб haversine
+        # рахувався лише для рядків всередині квадрата навколо точки
+        lat_delta = math.degrees(radius_m / EARTH_RADIUS_M)
+        min_lat = max(latitude - lat_delta, -90)
+        max_lat = min(latitude + lat_delta, 90)
+        queryset = self.filter(latitude__gte=min_lat, latitude__lte=max_lat)
+
+        cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+        if min_lat <= -90 or max_lat >= 90 or cos_lat <= 0:
+            return queryset
+
+        lon_delta = math.degrees(radius_m / (EARTH_RADIUS_M * cos_lat))
+        if lon_delta >= 180:
+            return queryset
+
+        min_lon = longitude - lon_delta
+        max_lon = longitude + lon_delta
+        if min_lon < -180:
+            return queryset.filter(
+                Q(longitude__gte=min_lon + 360) | Q(longitude__lte=max_lon)
+            )
+        if max_lon > 180:
+            return queryset.filter(
+                Q(longitude__gte=min_lon) | Q(longitude__lte=max_lon - 360)
+            )
+        return queryset.filter(longitude__gte=min_lon, longitude__lte=max_lon)
+
+    def annotate_distance(self, latitude, longitude):
+        lat = Radians(Cast("latitude", output_field=FloatField()))
+        lon = Radians(Cast("longitude", output_field=FloatField()))
+        origin_lat = math.radians(latitude)
+        origin_lon = math.radians(longitude)
+
+        a = Power(Sin((lat - origin_lat) / 2), 2) + math.cos(origin_lat) * Cos(
+            lat
+        ) * Power(Sin((lon - origin_lon) / 2), 2)
+
+        return self.annotate(
+            distance_m=ExpressionWrapper(
+                2 * EARTH_RADIUS_M * ASin(Least(Sqrt(a), 1.0)),
+                output_field=FloatField(),
+            )
+        )
+
 
 class Location(UUIDModel, TimestampedModel):
     name = models.CharField(max_length=255)
@@ -78,6 +172,8 @@ class Location(UUIDModel, TimestampedModel):
 
     is_active = models.BooleanField(default=True)
     view_count = models.PositiveBigIntegerField(default=0)
+    # оцінка HyperLogLog, оновлюється persist_unique_viewers
+    unique_viewers = models.PositiveBigIntegerField(default=0)
 
     objects = LocationQuerySet.as_manager()
 
@@ -88,9 +184,70 @@ class Location(UUIDModel, TimestampedModel):
             models.Index(fields=("is_active",)),
             models.Index(fields=("view_count",)),
             models.Index(fields=("created_at",)),
+            models.Index(fields=("updated_at",)),
             models.Index(fields=["name"]),
             models.Index(fields=["description"]),
         ]
 
     def __str__(self):
         return self.name
+
+
+class LocationActivity(UUIDModel):
+    location = models.ForeignKey(
+        Location,
+        on_delete=models.CASCADE,
+        related_name="activity",
+    )
+    # початок години
+    bucket = models.DateTimeField()
+    views = models.PositiveIntegerField(default=0)
+    reviews = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("location", "bucket")
+        verbose_name_plural = "Location activity"
+        indexes = [
+            models.Index(fields=("bucket",)),
+        ]
+
+    def __str__(self):
+        return f"{self.location_id} @ {self.bucket:%Y-%m-%d %H:00}"
+
+
+class ExportJob(UUIDModel, TimestampedModel):
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    class Format(models.TextChoices):
+        CSV = "csv", "CSV"
+        PARQUET = "parquet", "Parquet"
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="export_jobs",
+    )
+    status = models.CharField(
+        max_length=16, choices=Status.choices, default=Status.PENDING
+    )
+    format = models.CharField(max_length=16, choices=Format.choices, default=Format.CSV)
+    # параметри LocationFilterSet
+    filters = models.JSONField(default=dict, blank=True)
+    object_key = models.CharField(max_length=255, blank=True)
+    row_count = models.PositiveBigIntegerField(default=0)
+    error = models.TextField(blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=("status", "created_at")),
+        ]
+
+    def __str__(self):
+        return f"Export {self.id} ({self.status})"
@@ -31,6 +31,10 @@ async def fetch_weather(latitude, longitude):
             return {"error": f"Weather API error: {response.status}"}
 
 
+def weather_cache_key(latitude, longitude):
+    return f"{float(latitude):.4f}_{float(longitude):.4f}"
+
+
 async def get_weather_from_redis(redis_client, redis_key):
     cached = await redis_client.get(redis_key)
     if cached:
@@ -38,6 +42,13 @@ async def get_weather_from_redis(redis_client, redis_key):
     return None
 
 
+async def get_many_weather_from_redis(redis_client, redis_keys):
+    if not redis_keys:
+        return []
+    cached = await redis_client.mget(redis_keys)
+    return [json.loads(value) if value else None for value in cached]
+
+
 async def get_weather_from_s3(s3_key):
     try:
         obj = await sync_to_async(s3_client.get_object)(
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from test_task.locations.models import Location
+from test_task.locations.spatial import location_index
+
+
+@receiver(post_save, sender=Location)
+def update_location_index(sender, instance, **kwargs):
+    location_index.update(instance)
+
+
+@receiver(post_delete, sender=Location)
+def remove_from_location_index(sender, instance, **kwargs):
+    location_index.remove(instance.pk)
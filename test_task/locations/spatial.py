@@ -0,0 +1,185 @@
+import logging
+import threading
+import time
+import uuid
+
+import numpy as np
+from django.conf import settings
+from django.db import connections
+from scipy.spatial import cKDTree
+
+from test_task.locations.models import EARTH_RADIUS_M, Location
+
+logger = logging.getLogger(__name__)
+
+
+def to_unit_vectors(latitudes, longitudes):
+    lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lon = np.radians(np.asarray(longitudes, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+
+def chord_to_meters(chord):
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.clip(np.asarray(chord) / 2, 0, 1))
+
+
+# k-NN індекс активних локацій у пам'яті процесу.
+# Точки - одиничні вектори на сфері, тому хордова відстань монотонна з
+# відстанню по великому колу. Масиви лише для читання: індекс, побудований
+# до fork (gunicorn --preload), ділиться між воркерами через copy-on-write
+# лише до першої перебудови - далі в кожного воркера своя копія.
+# Індекс у кожному процесі свій: зміни з сигналів моделі йдуть в overlay
+# лише того процесу, що обробив запис, інші побачать їх після перебудови.
+# Перебудова раз на інтервал або коли overlay виростає - у фоновому потоці,
+# запит тим часом відповідає зі старого дерева й overlay. Синхронно, під
+# локом, будується лише порожній індекс.
+class LocationIndex:
+
+    def __init__(self, rebuild_interval=600, max_pending=1000):
+        self.rebuild_interval = rebuild_interval
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        # одна перебудова на процес одночасно
+        self._build_lock = threading.Lock()
+        self._tree = None
+        self._ids = np.empty(0, dtype="V16")
+        self._built_at = None
+        # id.bytes -> unit vector або None, якщо локацію прибрано
+        self._pending = {}
+        # ключі overlay, змінені під час поточної перебудови
+        self._changed = set()
+
+    @property
+    def is_built(self):
+        return self._built_at is not None
+
+    def __len__(self):
+        return len(self._ids)
+
+    def rebuild(self):
+        with self._lock:
+            self._changed = set()
+        rows = list(
+            Location.objects.filter(is_active=True)
+            .order_by()
+            .values_list("id", "latitude", "longitude")
+        )
+        ids = np.array([row[0].bytes for row in rows], dtype="V16")
+        points = to_unit_vectors(
+            [row[1] for row in rows], [row[2] for row in rows]
+        ).reshape(-1, 3)
+        ids.setflags(write=False)
+        points.setflags(write=False)
+
+        tree = cKDTree(points) if len(points) else None
+        with self._lock:
+            self._tree = tree
+            self._ids = ids
+            self._built_at = time.monotonic()
+            # зміни, що прийшли після вибірки, в дереві можуть бути відсутні
+            self._pending = {
+                key: self._pending[key] for key in self._changed if key in self._pending
+            }
+
+    def invalidate(self):
+        with self._lock:
+            self._built_at = None
+
+    def update(self, location):
+        if not self.is_built:
+            return
+        if not location.is_active:
+            self.remove(location.pk)
+            return
+        point = to_unit_vectors([location.latitude], [location.longitude])[0]
+        with self._lock:
+            self._pending[location.pk.bytes] = point
+            self._changed.add(location.pk.bytes)
+
+    def remove(self, location_id):
+        if not self.is_built:
+            return
+        with self._lock:
+            self._pending[location_id.bytes] = None
+            self._changed.add(location_id.bytes)
+
+    def needs_rebuild(self):
+        if self._built_at is None:
+            return True
+        if len(self._pending) > self.max_pending:
+            return True
+        return time.monotonic() - self._built_at > self.rebuild_interval
+
+    def ensure_built(self):
+        if self.is_built:
+            return
+        with self._build_lock:
+            # поки чекали на лок, індекс міг побудувати інший потік
+            if not self.is_built:
+                self.rebuild()
+
+    def schedule_rebuild(self):
+        if not self._build_lock.acquire(blocking=False):
+            return None
+        thread = threading.Thread(target=self._rebuild_in_background, daemon=True)
+        try:
+            thread.start()
+        except Exception:
+            self._build_lock.release()
+            raise
+        return thread
+
+    def _rebuild_in_background(self):
+        try:
+            self.rebuild()
+        except Exception:
+            logger.exception("Location index rebuild failed")
+        finally:
+            self._build_lock.release()
+            # у потоку своє з'єднання з БД
+            connections.close_all()
+
+    def nearest(self, latitude, longitude, k=10, exclude=None):
+        self.ensure_built()
+        if self.needs_rebuild():
+            self.schedule_rebuild()
+
+        with self._lock:
+            tree, ids, pending = self._tree, self._ids, dict(self._pending)
+
+        exclude_key = exclude.bytes if exclude is not None else None
+        skip = set(pending)
+        skip.add(exclude_key)
+
+        origin = to_unit_vectors([latitude], [longitude])[0]
+        candidates = []
+
+        if tree is not None:
+            # overlay і exclude маскують рядки дерева, тому беремо з запасом
+            count = min(k + len(skip), len(ids))
+            distances, positions = tree.query(origin, k=count)
+            distances = np.atleast_1d(distances)
+            positions = np.atleast_1d(positions)
+            for distance, position in zip(distances, positions):
+                if position >= len(ids):
+                    continue
+                key = ids[position].tobytes()
+                if key not in skip:
+                    candidates.append((distance, key))
+
+        for key, point in pending.items():
+            if point is None or key == exclude_key:
+                continue
+            candidates.append((np.linalg.norm(point - origin), key))
+
+        candidates.sort(key=lambda item: item[0])
+        return [
+            (uuid.UUID(bytes=key), float(chord_to_meters(distance)))
+            for distance, key in candidates[:k]
+        ]
+
+
+location_index = LocationIndex(
+    rebuild_interval=settings.LOCATION_INDEX_REBUILD_INTERVAL,
+)
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+from rest_framework.utils.encoders import JSONEncoder
+
+from test_task.locations.api.v1.serializers import (
+    LocationListSerializer,
+    LocationListValuesSerializer,
+)
+from test_task.locations.models import Location
+
+
+def to_json(data):
+    return json.loads(json.dumps(data, cls=JSONEncoder))
+
+
+@pytest.fixture
+def queryset():
+    queryset = Location.objects.select_related("category")
+    queryset = queryset.annotate_average_rating()
+    queryset = queryset.annotate_review_count()
+    return queryset.annotate_popularity_score()
+
+
+@pytest.mark.django_db
+class TestLocationListValuesSerializer:
+
+    def test_matches_model_serializer(self, queryset, location_factory, review_factory):
+        location = location_factory(latitude="50.45", longitude="-30.123456")
+        review_factory.create_batch(2, location=location)
+        location_factory.create_batch(3)
+
+        expected = LocationListSerializer(queryset, many=True).data
+        lean_serializer = LocationListValuesSerializer(queryset)
+        actual = lean_serializer.to_representation(
+            lean_serializer.get_queryset(queryset)
+        )
+
+        assert to_json(actual) == to_json(expected)
+        assert [list(row) for row in actual] == [list(row) for row in expected]
+
+    def test_matches_model_serializer_with_distance(self, queryset, location_factory):
+        location_factory.create_batch(3)
+        queryset = queryset.annotate_distance(50.45, 30.52)
+
+        expected = LocationListSerializer(queryset, many=True).data
+        lean_serializer = LocationListValuesSerializer(queryset)
+        actual = lean_serializer.to_representation(
+            lean_serializer.get_queryset(queryset)
+        )
+
+        assert to_json(actual) == to_json(expected)
+
+    def test_missing_annotations_fall_back_to_defaults(self, location_factory):
+        location_factory()
+        queryset = Location.objects.select_related("category")
+
+        expected = LocationListSerializer(queryset, many=True).data
+        lean_serializer = LocationListValuesSerializer(queryset)
+        actual = lean_serializer.to_representation(
+            lean_serializer.get_queryset(queryset)
+        )
+
+        assert to_json(actual) == to_json(expected)
+        assert "distance_m" not in actual[0]
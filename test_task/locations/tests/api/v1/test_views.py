@@ -1,7 +1,45 @@
+import csv
+import io
+import json
+import struct
+import threading
+import uuid
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pyarrow.parquet as pq
 import pytest
 from rest_framework import status
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework.reverse import reverse
 
+from test_task.locations import exports
+from test_task.locations.api.v1 import views
+from test_task.locations.api.v1.views import LocationDetailAPIView
+from test_task.locations.counters import view_counter
+from test_task.locations.models import ExportJob, Location
+from test_task.locations.spatial import location_index
+
+
+class FakeRedis:
+    instances = []
+
+    def __init__(self):
+        self.closed = False
+        FakeRedis.instances.append(self)
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    FakeRedis.instances = []
+    monkeypatch.setattr(views.redis, "Redis", FakeRedis)
+    return FakeRedis.instances
+
 
 @pytest.fixture
 def list_url():
@@ -108,6 +146,110 @@ class TestLocationListCreateAPIView:
         assert response.data["count"] == 1
         assert response.data["results"][0]["id"] == str(active_loc.id)
 
+    def test_lean_serializer(self, api_client, list_url, location_factory, settings):
+        settings.LEAN_SERIALIZERS = True
+        location = location_factory(latitude=50.45, is_active=True)
+
+        response = api_client.get(list_url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 1
+        assert response.data["results"][0]["id"] == str(location.id)
+        assert response.data["results"][0]["latitude"] == "50.450000"
+
+    @pytest.mark.parametrize("lean", [False, True])
+    def test_ndjson_stream(
+        self, api_client, list_url, location_factory, settings, lean
+    ):
+        settings.LEAN_SERIALIZERS = lean
+        locations = [
+            location_factory(view_count=count, is_active=True) for count in range(3)
+        ]
+        location_factory(is_active=False)
+
+        response = api_client.get(
+            list_url, {"format": "ndjson", "ordering": "view_count"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/x-ndjson"
+
+        lines = b"".join(response.streaming_content).splitlines()
+        records = [json.loads(line) for line in lines]
+        assert [record["id"] for record in records] == [
+            str(location.id) for location in locations
+        ]
+        assert all("weather" in record for record in records)
+
+    def test_ndjson_streams_chunk_by_chunk(
+        self, api_client, list_url, location_factory, monkeypatch
+    ):
+        monkeypatch.setattr(
+            views.AsyncLocationListCreateAPIView, "stream_chunk_size", 2
+        )
+        enriched = []
+        enrich_many = views.WeatherEnrichmentMixin.enrich_many
+
+        async def counting_enrich_many(self, locs, redis_client):
+            enriched.append(len(locs))
+            return await enrich_many(self, locs, redis_client)
+
+        monkeypatch.setattr(
+            views.WeatherEnrichmentMixin, "enrich_many", counting_enrich_many
+        )
+        location_factory.create_batch(5, is_active=True)
+
+        response = api_client.get(list_url, {"format": "ndjson"})
+        assert response.streaming
+        # sync iterator: WSGI віддає його по шматку, не вичитуючи наперед
+        assert not response.is_async
+
+        content = iter(response.streaming_content)
+        assert json.loads(next(content))["id"]
+        assert enriched == [2]
+
+        assert len(list(content)) == 4
+        assert enriched == [2, 2, 1]
+
+    def test_updated_since_returns_changes_and_tombstones(
+        self, api_client, list_url, location_factory
+    ):
+        past = timezone.now() - timedelta(days=1)
+        unchanged = location_factory(is_active=True)
+        changed = location_factory(is_active=True)
+        deleted = location_factory(is_active=False)
+        deleted_long_ago = location_factory(is_active=False)
+        Location.objects.filter(pk__in=[unchanged.pk, deleted_long_ago.pk]).update(
+            created_at=past, updated_at=past
+        )
+
+        since = (past + timedelta(hours=1)).isoformat()
+        response = api_client.get(list_url, {"updated_since": since})
+        assert response.status_code == status.HTTP_200_OK
+        assert [loc["id"] for loc in response.data["results"]] == [str(changed.id)]
+        assert response.data["deleted"] == [str(deleted.id)]
+
+        response = api_client.get(
+            list_url, {"updated_since": since, "format": "ndjson"}
+        )
+        lines = b"".join(response.streaming_content).splitlines()
+        assert [json.loads(line) for line in lines][-1] == {
+            "id": str(deleted.id),
+            "deleted": True,
+        }
+
+    def test_no_tombstones_without_updated_since(
+        self, api_client, list_url, location_factory
+    ):
+        location_factory(is_active=False)
+
+        response = api_client.get(list_url)
+        assert response.status_code == status.HTTP_200_OK
+        assert "deleted" not in response.data
+
+    def test_invalid_updated_since(self, api_client, list_url):
+        response = api_client.get(list_url, {"updated_since": "yesterday"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "updated_since" in response.data
+
     def test_search_by_name(self, api_client, list_url, location_factory):
         abc_loc = location_factory(name="abc", is_active=True)
         zxc_loc = location_factory(name="zxc", is_active=True)
@@ -141,6 +283,331 @@ class TestLocationListCreateAPIView:
         actual_ids = [loc["id"] for loc in response.data["results"]]
         assert actual_ids == [str(loc_20_views.id), str(loc_10_views.id)]
 
+    def test_order_by_trending(
+        self, api_client, list_url, location_factory, location_activity_factory
+    ):
+        old_favourite = location_factory(view_count=10_000, is_active=True)
+        hot = location_factory(view_count=0, is_active=True)
+        location_activity_factory(location=hot, views=50, reviews=2)
+
+        response = api_client.get(list_url, {"ordering": "-trending"})
+        assert response.status_code == status.HTTP_200_OK
+        actual_ids = [loc["id"] for loc in response.data["results"]]
+        assert actual_ids == [str(hot.id), str(old_favourite.id)]
+
+    def test_list_is_cached_until_location_is_updated(
+        self, api_client, list_url, location_factory, user_factory, locmem_cache
+    ):
+        location = location_factory(name="abc", is_active=True)
+        response = api_client.get(list_url)
+        assert response.data["results"][0]["name"] == "abc"
+
+        location.name = "zxc"
+        location.save()
+        response = api_client.get(list_url)
+        assert response.data["results"][0]["name"] == "abc"
+
+        api_client.force_authenticate(user=user_factory(is_staff=True))
+        detail_url = reverse("v1:location_detail", kwargs={"pk": location.pk})
+        api_client.patch(detail_url, {"name": "qwe"})
+
+        api_client.force_authenticate(user=None)
+        response = api_client.get(list_url)
+        assert response.data["results"][0]["name"] == "qwe"
+
+    def test_not_modified(self, api_client, list_url, locmem_cache):
+        response = api_client.get(list_url)
+        assert response["Cache-Control"] == "public, max-age=0, must-revalidate"
+        assert "Accept" in response["Vary"]
+
+        response = api_client.get(list_url, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_etag_depends_on_params_and_user(
+        self, api_client, list_url, user_factory, locmem_cache
+    ):
+        etag = api_client.get(list_url)["ETag"]
+
+        assert api_client.get(list_url, {"ordering": "name"})["ETag"] != etag
+
+        api_client.force_authenticate(user=user_factory(is_staff=True))
+        response = api_client.get(list_url)
+        assert response["ETag"] != etag
+        assert "private" in response["Cache-Control"]
+
+    def test_etag_expires_with_weather_and_counters(
+        self, api_client, list_url, locmem_cache, monkeypatch, settings
+    ):
+        now = [1_000 * settings.CACHE_TTL]
+        monkeypatch.setattr(
+            "test_task.core.views.time", SimpleNamespace(time=lambda: now[0])
+        )
+        etag = api_client.get(list_url)["ETag"]
+        lean_etag = api_client.get(list_url, {"fields": "id,name"})["ETag"]
+
+        now[0] += settings.CACHE_TTL
+        response = api_client.get(list_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+
+        # без погоди й лічильників ETag тримається до bump namespace
+        response = api_client.get(
+            list_url, {"fields": "id,name"}, HTTP_IF_NONE_MATCH=lean_etag
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_order_by_distance(self, api_client, list_url, location_factory):
+        far_loc = location_factory(latitude=50.5, longitude=30.6, is_active=True)
+        near_loc = location_factory(latitude=50.451, longitude=30.524, is_active=True)
+        location_factory(latitude=49.8397, longitude=24.0297, is_active=True)
+
+        response = api_client.get(
+            list_url, {"from": "50.4501,30.5234", "ordering": "distance"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 2
+        actual_ids = [loc["id"] for loc in response.data["results"]]
+        assert actual_ids == [str(near_loc.id), str(far_loc.id)]
+        assert response.data["results"][0]["distance_m"] < 200
+
+    def test_order_by_distance_without_origin_is_ignored(self, api_client, list_url):
+        response = api_client.get(list_url, {"ordering": "distance"})
+        assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"from": "abc"},
+            {"from": "91,0"},
+            {"from": "50,30", "radius": "0"},
+            {"from": "50,30", "radius": "100000000"},
+        ],
+    )
+    def test_invalid_distance_params(self, api_client, list_url, params):
+        response = api_client.get(list_url, params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.parametrize("lean", [False, True])
+    def test_sparse_fields(
+        self, api_client, list_url, location_factory, settings, lean
+    ):
+        settings.LEAN_SERIALIZERS = lean
+        location = location_factory(is_active=True)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(
+                list_url, {"fields": "id,name,latitude,longitude"}
+            )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["results"] == [
+            {
+                "id": str(location.id),
+                "name": location.name,
+                "latitude": f"{location.latitude:.6f}",
+                "longitude": f"{location.longitude:.6f}",
+            }
+        ]
+
+        sql = queries[-1]["sql"].lower()
+        assert "description" not in sql
+        assert "avg(" not in sql
+        assert "count(" not in sql
+
+    def test_sparse_fields_keep_ordering_annotations(
+        self, api_client, list_url, location_factory, review_factory
+    ):
+        rated = location_factory(is_active=True, view_count=0)
+        review_factory(location=rated, rating=5)
+        unrated = location_factory(is_active=True, view_count=0)
+
+        response = api_client.get(
+            list_url, {"fields": "id,category_name", "ordering": "-popularity_score"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["results"] == [
+            {"id": str(rated.id), "category_name": rated.category.name},
+            {"id": str(unrated.id), "category_name": unrated.category.name},
+        ]
+
+    def test_unknown_sparse_field(self, api_client, list_url):
+        response = api_client.get(list_url, {"fields": "id,password"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "fields" in response.data
+
+
+@pytest.mark.django_db
+class TestLocationNearbyAPIView:
+
+    @pytest.fixture(autouse=True)
+    def fresh_index(self):
+        location_index.invalidate()
+
+    def test_returns_nearest_locations(self, api_client, location_factory):
+        location = location_factory(latitude=50.4501, longitude=30.5234, is_active=True)
+        far_loc = location_factory(latitude=49.8397, longitude=24.0297, is_active=True)
+        near_loc = location_factory(latitude=50.4547, longitude=30.5238, is_active=True)
+        location_factory(latitude=50.4502, longitude=30.5235, is_active=False)
+
+        url = reverse("v1:location_nearby", kwargs={"pk": location.pk})
+        response = api_client.get(url, {"limit": 5})
+        assert response.status_code == status.HTTP_200_OK
+
+        actual_ids = [loc["id"] for loc in response.data]
+        assert actual_ids == [str(near_loc.id), str(far_loc.id)]
+        assert response.data[0]["distance_m"] < response.data[1]["distance_m"]
+
+    def test_inactive_location_not_found(self, api_client, location_factory):
+        location = location_factory(is_active=False)
+
+        url = reverse("v1:location_nearby", kwargs={"pk": location.pk})
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.parametrize("limit", ["abc", "0", "101"])
+    def test_invalid_limit(self, api_client, location, limit):
+        url = reverse("v1:location_nearby", kwargs={"pk": location.pk})
+        response = api_client.get(url, {"limit": limit})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestLocationBatchAPIView:
+
+    @pytest.fixture
+    def batch_url(self):
+        return reverse("v1:location_batch")
+
+    def test_returns_locations_in_requested_order(
+        self, api_client, batch_url, location_factory, django_assert_num_queries
+    ):
+        first = location_factory(is_active=True, view_count=3)
+        second = location_factory(is_active=True, view_count=3)
+        inactive = location_factory(is_active=False)
+        ids = [second.id, first.id, second.id, inactive.id]
+
+        with django_assert_num_queries(1):
+            response = api_client.get(
+                batch_url, {"ids": ",".join(str(pk) for pk in ids)}
+            )
+        assert response.status_code == status.HTTP_200_OK
+        assert [loc["id"] for loc in response.data["results"]] == [
+            str(second.id),
+            str(first.id),
+        ]
+        assert response.data["not_found"] == [str(inactive.id)]
+        assert all("weather" in loc for loc in response.data["results"])
+
+        first.refresh_from_db()
+        assert first.view_count == 3
+
+    def test_closes_redis_client(
+        self, api_client, batch_url, location_factory, fake_redis
+    ):
+        location = location_factory(is_active=True)
+
+        response = api_client.get(batch_url, {"ids": str(location.id)})
+        assert response.status_code == status.HTTP_200_OK
+        assert fake_redis and all(client.closed for client in fake_redis)
+
+    @pytest.mark.parametrize("ids", ["", "abc", ",".join(["1" * 32] * 2) + ",x"])
+    def test_invalid_ids(self, api_client, batch_url, ids):
+        response = api_client.get(batch_url, {"ids": ids})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_too_many_ids(self, api_client, batch_url):
+        ids = ",".join(str(uuid.uuid4()) for _ in range(201))
+        response = api_client.get(batch_url, {"ids": ids})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestLocationPinsAPIView:
+
+    @pytest.fixture
+    def pins_url(self):
+        return reverse("v1:location_pins")
+
+    def test_returns_columns(self, api_client, pins_url, location_factory):
+        location = location_factory(latitude=50.45, longitude=30.52, is_active=True)
+        location_factory(is_active=False)
+
+        response = api_client.get(pins_url)
+        assert response.status_code == status.HTTP_200_OK
+
+        data = response.json()
+        assert data["count"] == 1
+        assert data["id"] == [str(location.id)]
+        assert data["latitude"] == [50.45]
+        assert data["longitude"] == [30.52]
+        assert data["categories"] == [
+            {"id": str(location.category_id), "name": location.category.name}
+        ]
+        assert data["category"] == [0]
+
+    def test_filter_by_category_name(
+        self, api_client, pins_url, location_factory, category_factory
+    ):
+        zxc_loc = location_factory(
+            category=category_factory(name="zxc"), is_active=True
+        )
+        location_factory(category=category_factory(name="abc"), is_active=True)
+
+        response = api_client.get(pins_url, {"category_name": "xc"})
+        assert response.json()["id"] == [str(zxc_loc.id)]
+
+    def test_binary_format(self, api_client, pins_url, location_factory):
+        location = location_factory(latitude=50.45, longitude=30.52, is_active=True)
+
+        response = api_client.get(pins_url, {"format": "bin"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/octet-stream"
+
+        payload = response.content
+        assert payload[:4] == b"PIN1"
+        count, category_count = struct.unpack_from("<IH", payload, 4)
+        assert (count, category_count) == (1, 1)
+
+        offset = 10 + 16
+        (name_length,) = struct.unpack_from("<H", payload, offset)
+        offset += 2 + name_length
+        assert payload[offset : offset + 16] == location.id.bytes
+        offset += 16
+        latitude, longitude, _ = struct.unpack_from("<3f", payload, offset)
+        assert latitude == pytest.approx(50.45)
+        assert longitude == pytest.approx(30.52)
+
+    def test_not_modified(
+        self, api_client, pins_url, location_factory, user_factory, locmem_cache
+    ):
+        location = location_factory(is_active=True)
+
+        response = api_client.get(pins_url)
+        etag = response["ETag"]
+
+        response = api_client.get(pins_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        api_client.force_authenticate(user=user_factory(is_staff=True))
+        detail_url = reverse("v1:location_detail", kwargs={"pk": location.pk})
+        api_client.delete(detail_url)
+        api_client.force_authenticate(user=None)
+
+        response = api_client.get(pins_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["count"] == 0
+
+    def test_etag_expires_with_popularity(
+        self, api_client, pins_url, locmem_cache, monkeypatch, settings
+    ):
+        now = [1_000 * settings.CACHE_TTL]
+        monkeypatch.setattr(
+            "test_task.core.views.time", SimpleNamespace(time=lambda: now[0])
+        )
+        etag = api_client.get(pins_url)["ETag"]
+
+        now[0] += settings.CACHE_TTL
+        response = api_client.get(pins_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+
 
 @pytest.mark.django_db
 class TestLocationDetailAPIView:
@@ -219,9 +686,180 @@ class TestLocationDetailAPIView:
 
         old_view_count = location.view_count
 
+        view_counter.flush()
         location.refresh_from_db()
         assert location.view_count == (old_view_count + 1)
 
+    def test_slow_view_counter_does_not_block_response(
+        self, api_client, detail_url, location, monkeypatch, settings
+    ):
+        settings.RECORD_VIEWS_IN_BACKGROUND = True
+        release = threading.Event()
+        recorded = threading.Event()
+
+        def slow_record(location_id, visitor_id):
+            release.wait(5)
+            recorded.set()
+
+        monkeypatch.setattr(views, "record_location_view", slow_record)
+
+        response = api_client.get(detail_url)
+        assert response.status_code == status.HTTP_200_OK
+        assert not recorded.is_set()
+
+        release.set()
+        assert recorded.wait(5)
+
+    def test_not_modified(self, api_client, detail_url, locmem_cache):
+        response = api_client.get(detail_url)
+        etag = response["ETag"]
+
+        response = api_client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_sparse_fields(self, api_client, detail_url, location):
+        response = api_client.get(detail_url, {"fields": "id,category,review_count"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {
+            "id": str(location.id),
+            "category": {
+                "id": str(location.category_id),
+                "name": location.category.name,
+            },
+            "review_count": 0,
+        }
+
+    def test_detail_includes_weather(self, api_client, detail_url, monkeypatch):
+        async def enrich_with_weather(self, loc, redis_client):
+            loc["weather"] = {"temperature": 21.5}
+            return loc
+
+        monkeypatch.setattr(
+            LocationDetailAPIView, "enrich_with_weather", enrich_with_weather
+        )
+        response = api_client.get(detail_url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["weather"] == {"temperature": 21.5}
+
+    def test_detail_without_weather_when_lookup_fails(
+        self, api_client, detail_url, monkeypatch
+    ):
+        async def enrich_with_weather(self, loc, redis_client):
+            raise ConnectionError
+
+        monkeypatch.setattr(
+            LocationDetailAPIView, "enrich_with_weather", enrich_with_weather
+        )
+        response = api_client.get(detail_url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["weather"] is None
+
+    def test_detail_closes_redis_client(self, api_client, detail_url, fake_redis):
+        response = api_client.get(detail_url)
+        assert response.status_code == status.HTTP_200_OK
+        assert fake_redis and all(client.closed for client in fake_redis)
+
+    def test_no_weather_lookup_for_hidden_location(
+        self, api_client, location_factory, monkeypatch
+    ):
+        calls = []
+
+        async def enrich_with_weather(self, loc, redis_client):
+            calls.append(loc)
+            return loc
+
+        monkeypatch.setattr(
+            LocationDetailAPIView, "enrich_with_weather", enrich_with_weather
+        )
+        location = location_factory(is_active=False)
+        url = reverse("v1:location_detail", kwargs={"pk": location.pk})
+
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert calls == []
+
+    def test_due_view_count_flush_does_not_break_detail(
+        self, api_client, detail_url, location
+    ):
+        # без django-redis запис перегляду сам робить flush у БД
+        view_counter.flush()
+        view_counter._flushed_at -= 10_000
+
+        response = api_client.get(detail_url)
+        assert response.status_code == status.HTTP_200_OK
+
+        old_view_count = location.view_count
+        location.refresh_from_db()
+        assert location.view_count == old_view_count + 1
+
+    def test_detail_skips_weather_outside_sparse_fields(
+        self, api_client, detail_url, location
+    ):
+        response = api_client.get(detail_url, {"fields": "id,name"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {"id": str(location.id), "name": location.name}
+
+    def test_detail_is_cached_until_location_is_updated(
+        self, api_client, detail_url, location, user_factory, locmem_cache
+    ):
+        api_client.get(detail_url)
+        Location.objects.filter(pk=location.pk).update(name="changed directly")
+
+        response = api_client.get(detail_url)
+        assert response.data["name"] == location.name
+
+        api_client.force_authenticate(user=user_factory(is_staff=True))
+        api_client.patch(detail_url, {"name": "changed via api"})
+        api_client.force_authenticate(user=None)
+
+        response = api_client.get(detail_url)
+        assert response.data["name"] == "changed via api"
+
+    def test_cached_detail_is_split_by_staff_variant(
+        self, api_client, location_factory, user_factory, locmem_cache
+    ):
+        inactive = location_factory(is_active=False)
+        url = reverse("v1:location_detail", kwargs={"pk": inactive.pk})
+
+        api_client.force_authenticate(user=user_factory(is_staff=True))
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+
+        api_client.force_authenticate(user=user_factory())
+        assert api_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_cached_detail_still_counts_views(
+        self, api_client, detail_url, location, locmem_cache
+    ):
+        view_counter.flush()
+        api_client.get(detail_url)
+        api_client.get(detail_url)
+
+        view_counter.flush()
+        old_view_count = location.view_count
+        location.refresh_from_db()
+        assert location.view_count == old_view_count + 2
+
+    def test_etag_changes_after_review(
+        self,
+        api_client,
+        detail_url,
+        location,
+        user_factory,
+        locmem_cache,
+        django_capture_on_commit_callbacks,
+    ):
+        etag = api_client.get(detail_url)["ETag"]
+
+        api_client.force_authenticate(user=user_factory())
+        review_list_url = reverse("v1:review_list", kwargs={"location_id": location.pk})
+        data = {"title": "test title", "body": "test body", "rating": 3}
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post(review_list_url, data)
+
+        response = api_client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["review_count"] == 1
+
     def test_delete_deactivates_location(
         self, api_client, user_factory, detail_url, location
     ):
@@ -233,3 +871,178 @@ class TestLocationDetailAPIView:
 
         location.refresh_from_db()
         assert location.is_active is False
+
+
+@pytest.mark.django_db
+class TestLocationExportCSVAPIView:
+
+    @pytest.fixture
+    def export_url(self):
+        return reverse("v1:location_export_csv")
+
+    def test_anonymous_user(self, api_client, export_url):
+        response = api_client.get(export_url)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_streams_all_locations(
+        self, api_client, export_url, location_factory, user_factory
+    ):
+        locations = location_factory.create_batch(3)
+        api_client.force_authenticate(user=user_factory())
+
+        response = api_client.get(export_url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+
+        content = b"".join(response.streaming_content).decode("utf-8-sig")
+        rows = list(csv.DictReader(io.StringIO(content)))
+        assert {row["id"] for row in rows} == {str(loc.id) for loc in locations}
+        assert rows[0]["category__name"]
+
+    @pytest.mark.skipif(
+        not exports.can_copy("default"), reason="COPY needs PostgreSQL with psycopg2"
+    )
+    def test_copy_output_matches_fallback(
+        self, api_client, export_url, location_factory, user_factory, settings
+    ):
+        location_factory(description="", is_active=False)
+        location_factory(name='Quoted, "name"')
+        api_client.force_authenticate(user=user_factory())
+
+        def export():
+            response = api_client.get(export_url)
+            content = b"".join(response.streaming_content)
+            return sorted(content.splitlines())
+
+        settings.EXPORT_USE_COPY = True
+        copied = export()
+        settings.EXPORT_USE_COPY = False
+        assert copied == export()
+
+
+@pytest.mark.django_db
+class TestLocationExportParquetAPIView:
+
+    @pytest.fixture
+    def export_url(self):
+        return reverse("v1:location_export_parquet")
+
+    def test_anonymous_user(self, api_client, export_url):
+        response = api_client.get(export_url)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_streams_filtered_parquet(
+        self, api_client, export_url, location_factory, category_factory, user_factory
+    ):
+        parks = location_factory.create_batch(2, category=category_factory(name="park"))
+        location_factory()
+        api_client.force_authenticate(user=user_factory())
+
+        response = api_client.get(export_url, {"category_name": "park"})
+        assert response.status_code == status.HTTP_200_OK
+
+        table = pq.read_table(io.BytesIO(b"".join(response.streaming_content)))
+        assert set(table.column("id").to_pylist()) == {str(loc.id) for loc in parks}
+        assert table.column("review_count").to_pylist() == [0, 0]
+
+
+@pytest.mark.django_db
+class TestLocationExportJobAPIView:
+
+    @pytest.fixture
+    def export_url(self):
+        return reverse("v1:location_export")
+
+    def test_anonymous_user(self, api_client, export_url):
+        response = api_client.post(export_url, {}, format="json")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_enqueues_job(self, api_client, export_url, user_factory):
+        user = user_factory()
+        api_client.force_authenticate(user=user)
+
+        data = {"filters": {"category_name": "park", "unknown": "1"}}
+        response = api_client.post(export_url, data, format="json")
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data["status"] == ExportJob.Status.PENDING
+        assert response.data["download_url"] is None
+
+        job = ExportJob.objects.get(pk=response.data["id"])
+        assert job.user == user
+        assert job.filters == {"category_name": "park"}
+
+    def test_invalid_filters(self, api_client, export_url, user_factory):
+        api_client.force_authenticate(user=user_factory())
+
+        data = {"filters": {"average_rating_min": "abc"}}
+        response = api_client.post(export_url, data, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_status_is_visible_to_owner_only(self, api_client, user_factory):
+        job = ExportJob.objects.create(
+            user=user_factory(),
+            status=ExportJob.Status.DONE,
+            object_key="exports/locations/test.csv",
+        )
+        url = reverse("v1:location_export_detail", kwargs={"pk": job.pk})
+
+        api_client.force_authenticate(user=user_factory())
+        assert api_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+        api_client.force_authenticate(user=job.user)
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert "exports/locations/test.csv" in response.data["download_url"]
+
+
+@pytest.mark.django_db
+class TestLocationImportAPIView:
+
+    @pytest.fixture
+    def import_url(self):
+        return reverse("v1:location_import")
+
+    def make_file(self, name, content):
+        file = io.BytesIO(content)
+        file.name = name
+        return file
+
+    def test_admin_only(self, api_client, import_url, user_factory):
+        api_client.force_authenticate(user=user_factory())
+        response = api_client.post(import_url, {}, format="multipart")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_imports_ndjson(
+        self, api_client, import_url, user_factory, category_factory
+    ):
+        category_factory(name="park")
+        api_client.force_authenticate(user=user_factory(is_staff=True))
+        content = b"\n".join(
+            [
+                b'{"name": "A", "category": "park", "latitude": 1, '
+                b'"longitude": 1, "address": "Street 1"}',
+                b'{"name": "B", "category": "park", "latitude": 2}',
+            ]
+        )
+
+        response = api_client.post(
+            import_url,
+            {"file": self.make_file("places.ndjson", content)},
+            format="multipart",
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["created"] == 1
+        assert response.data["error_count"] == 1
+        assert response.data["errors"][0]["row"] == 2
+        assert Location.objects.filter(address="Street 1").exists()
+
+    def test_unknown_format(self, api_client, import_url, user_factory):
+        api_client.force_authenticate(user=user_factory(is_staff=True))
+
+        response = api_client.post(
+            import_url,
+            {"file": self.make_file("places.xlsx", b"data")},
+            format="multipart",
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "format" in response.data
@@ -1,6 +1,7 @@
 import factory
+from django.utils import timezone
 
-from test_task.locations.models import Category, Location
+from test_task.locations.models import Category, Location, LocationActivity
 
 
 class CategoryFactory(factory.django.DjangoModelFactory):
@@ -27,3 +28,15 @@ class LocationFactory(factory.django.DjangoModelFactory):
 
     is_active = factory.Faker("boolean")
     view_count = factory.Faker("pyint", min_value=0, max_value=1000)
+
+
+class LocationActivityFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = LocationActivity
+
+    location = factory.SubFactory(LocationFactory)
+    bucket = factory.LazyFunction(
+        lambda: timezone.now().replace(minute=0, second=0, microsecond=0)
+    )
+    views = factory.Faker("pyint", min_value=0, max_value=100)
+    reviews = factory.Faker("pyint", min_value=0, max_value=10)
@@ -0,0 +1,148 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from test_task.locations.counters import (
+    ActivityCounter,
+    BackgroundRecorder,
+    UniqueViewerCounter,
+    ViewCounter,
+)
+from test_task.locations.models import LocationActivity
+
+
+@pytest.mark.django_db
+class TestViewCounter:
+
+    @pytest.fixture
+    def counter(self):
+        return ViewCounter(flush_interval=3600, batch_size=2)
+
+    def test_flush_applies_buffered_views(
+        self, counter, location_factory, django_assert_num_queries
+    ):
+        locations = [location_factory(view_count=10) for _ in range(3)]
+        for location in locations:
+            counter.record(location.pk)
+        counter.record(locations[0].pk)
+
+        with django_assert_num_queries(2):
+            assert counter.flush() == 3
+
+        for location, expected in zip(locations, (12, 11, 11)):
+            location.refresh_from_db()
+            assert location.view_count == expected
+
+        assert counter.flush() == 0
+
+    def test_flushes_when_interval_passed(self, location_factory):
+        counter = ViewCounter(flush_interval=0)
+        location = location_factory(view_count=0)
+
+        counter.record(location.pk)
+
+        location.refresh_from_db()
+        assert location.view_count == 1
+
+    def test_failed_flush_keeps_views(self, counter, location_factory, monkeypatch):
+        location = location_factory(view_count=0)
+        counter.record(location.pk)
+
+        def fail(items):
+            raise RuntimeError
+
+        monkeypatch.setattr(counter, "apply", fail)
+        with pytest.raises(RuntimeError):
+            counter.flush()
+
+        assert counter.drain() == {location.pk: 1}
+
+
+@pytest.mark.django_db
+class TestActivityCounter:
+
+    def test_rollup_writes_hourly_buckets(self, location_factory):
+        counter = ActivityCounter()
+        now = datetime(2025, 7, 1, 12, 30, tzinfo=timezone.utc)
+        location = location_factory()
+
+        counter.record(location.pk, "views", now)
+        counter.record(location.pk, "views", now)
+        counter.record(location.pk, "reviews", now - timedelta(hours=1))
+
+        assert counter.rollup(hours=2, now=now) == 2
+        activity = {
+            row.bucket: (row.views, row.reviews)
+            for row in LocationActivity.objects.filter(location=location)
+        }
+        assert activity == {
+            datetime(2025, 7, 1, 12, tzinfo=timezone.utc): (2, 0),
+            datetime(2025, 7, 1, 11, tzinfo=timezone.utc): (0, 1),
+        }
+
+        # повторний rollup переписує значення, а не додає їх
+        counter.record(location.pk, "views", now)
+        counter.rollup(hours=2, now=now)
+        row = LocationActivity.objects.get(
+            location=location, bucket=datetime(2025, 7, 1, 12, tzinfo=timezone.utc)
+        )
+        assert row.views == 3
+
+    def test_expired_buckets_are_pruned(self, location_factory):
+        counter = ActivityCounter(bucket_ttl=3600)
+        now = datetime(2025, 7, 1, 12, tzinfo=timezone.utc)
+        location = location_factory()
+
+        counter.record(location.pk, "views", now - timedelta(hours=3))
+        counter.record(location.pk, "views", now)
+
+        assert counter.get_bucket("views", now - timedelta(hours=3)) == {}
+        assert counter.get_bucket("views", now) == {location.pk: 1}
+
+
+@pytest.mark.django_db
+class TestUniqueViewerCounter:
+
+    def test_persist_counts_each_visitor_once(self, location_factory):
+        counter = UniqueViewerCounter()
+        now = datetime(2025, 7, 2, 9, tzinfo=timezone.utc)
+        location = location_factory(unique_viewers=0)
+        other = location_factory(unique_viewers=0)
+
+        for visitor in ("a", "b", "a", "a"):
+            counter.record(location.pk, visitor, now)
+        counter.record(location.pk, "b", now - timedelta(days=1))
+        counter.record(location.pk, "c", now - timedelta(days=1))
+        counter.record(other.pk, "a", now)
+
+        assert counter.persist(days=2, now=now) == 2
+        location.refresh_from_db()
+        other.refresh_from_db()
+        assert location.unique_viewers == 3
+        assert other.unique_viewers == 1
+
+        # повторне злиття - об'єднання, тож значення не ростуть
+        counter.record(location.pk, "a", now)
+        counter.persist(days=2, now=now)
+        location.refresh_from_db()
+        assert location.unique_viewers == 3
+
+
+class TestBackgroundRecorder:
+
+    def test_logs_failures(self, settings, caplog):
+        settings.RECORD_VIEWS_IN_BACKGROUND = True
+
+        def fail(location_id):
+            raise ConnectionError("redis is down")
+
+        future = BackgroundRecorder(max_workers=1).submit(fail, 1)
+        future.result(timeout=5)
+        assert "Failed to record location view" in caplog.text
+
+    def test_runs_inline_when_disabled(self, settings):
+        settings.RECORD_VIEWS_IN_BACKGROUND = False
+        calls = []
+
+        assert BackgroundRecorder().submit(calls.append, 1) is None
+        assert calls == [1]
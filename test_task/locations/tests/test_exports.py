@@ -0,0 +1,254 @@
+import csv
+import io
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+
+import pyarrow.parquet as pq
+import pytest
+from django.utils import timezone
+
+from test_task.locations import exports
+from test_task.locations.models import ExportJob, Location
+
+
+class FakeS3Client:
+
+    def __init__(self, fail_on_part=None):
+        self.fail_on_part = fail_on_part
+        self.parts = {}
+        self.objects = {}
+        self.aborted = []
+
+    def create_multipart_upload(self, Bucket, Key, ContentType):
+        self.parts[Key] = []
+        return {"UploadId": f"upload-{Key}"}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        if PartNumber == self.fail_on_part:
+            raise ConnectionError("connection reset")
+        self.parts[Key].append(Body)
+        return {"ETag": f'"{PartNumber}"'}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        assert [part["PartNumber"] for part in MultipartUpload["Parts"]] == list(
+            range(1, len(self.parts[Key]) + 1)
+        )
+        self.objects[Key] = b"".join(self.parts.pop(Key))
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.aborted.append(Key)
+
+
+def fake_copy(rows):
+    def copy_csv(raw_connection, queryset, file):
+        for row in rows:
+            file.write(row)
+        return len(rows)
+
+    return copy_csv
+
+
+requires_copy = pytest.mark.skipif(
+    not exports.can_copy("default"), reason="COPY needs PostgreSQL with psycopg2"
+)
+
+
+@pytest.fixture
+def s3(monkeypatch, settings):
+    settings.EXPORT_PART_SIZE = 256
+    client = FakeS3Client()
+    monkeypatch.setattr(exports, "s3_client", client)
+    return client
+
+
+@pytest.mark.django_db
+class TestExportWorker:
+
+    def test_claims_jobs_in_order(self, user_factory):
+        user = user_factory()
+        first = ExportJob.objects.create(user=user)
+        second = ExportJob.objects.create(user=user)
+
+        assert exports.claim_next_job() == first
+        assert exports.claim_next_job() == second
+        assert exports.claim_next_job() is None
+
+        first.refresh_from_db()
+        assert first.status == ExportJob.Status.RUNNING
+        assert first.started_at is not None
+
+    def test_uploads_filtered_csv_in_parts(
+        self, s3, user_factory, location_factory, category_factory
+    ):
+        category = category_factory(name="museum")
+        museums = location_factory.create_batch(5, category=category)
+        location_factory.create_batch(2)
+        job = ExportJob.objects.create(
+            user=user_factory(), filters={"category_name": "muse"}
+        )
+
+        job = exports.process_job(exports.claim_next_job())
+        assert job.status == ExportJob.Status.DONE
+        assert job.row_count == 5
+
+        content = s3.objects[job.object_key].decode("utf-8-sig")
+        rows = list(csv.DictReader(io.StringIO(content)))
+        assert {row["id"] for row in rows} == {str(loc.id) for loc in museums}
+
+    def test_delta_export_includes_deactivated_locations(
+        self, s3, user_factory, location_factory
+    ):
+        past = timezone.now() - timedelta(days=1)
+        unchanged = location_factory()
+        Location.objects.filter(pk=unchanged.pk).update(
+            created_at=past, updated_at=past
+        )
+        changed = location_factory(is_active=True)
+        deleted = location_factory(is_active=False)
+        job = ExportJob.objects.create(
+            user=user_factory(),
+            filters={"updated_since": (past + timedelta(hours=1)).isoformat()},
+        )
+
+        job = exports.process_job(exports.claim_next_job())
+        assert job.status == ExportJob.Status.DONE
+
+        content = s3.objects[job.object_key].decode("utf-8-sig")
+        rows = {row["id"]: row for row in csv.DictReader(io.StringIO(content))}
+        assert set(rows) == {str(changed.id), str(deleted.id)}
+        assert rows[str(deleted.id)]["is_active"] == "False"
+
+    def test_csv_values_format(self, s3, user_factory, location_factory):
+        location = location_factory(description="", is_active=False)
+        created_at = datetime(2024, 1, 2, 3, 4, 5, tzinfo=dt_timezone.utc)
+        Location.objects.filter(pk=location.pk).update(created_at=created_at)
+        job = ExportJob.objects.create(user=user_factory())
+
+        job = exports.process_job(exports.claim_next_job())
+
+        content = s3.objects[job.object_key].decode("utf-8-sig")
+        assert "\r" not in content
+        row = next(csv.DictReader(io.StringIO(content)))
+        assert row["is_active"] == "False"
+        assert row["description"] == ""
+        assert row["created_at"] == "2024-01-02T03:04:05.000000Z"
+
+    def test_csv_quotes_line_breaks(self, s3, user_factory, location_factory):
+        location_factory(name="carriage\rreturn", description="line\nbreak")
+        job = ExportJob.objects.create(user=user_factory())
+
+        job = exports.process_job(exports.claim_next_job())
+
+        content = s3.objects[job.object_key].decode("utf-8-sig")
+        # як у COPY: \r і \n лише в лапках, рядки закінчуються \n
+        assert '"carriage\rreturn"' in content
+        assert '"line\nbreak"' in content
+        assert content.endswith("\n") and not content.endswith("\r\n")
+        row = next(csv.DictReader(io.StringIO(content, newline="")))
+        assert row["name"] == "carriage\rreturn"
+
+    def test_failed_upload_is_aborted(self, s3, user_factory, location_factory):
+        s3.fail_on_part = 1
+        location_factory.create_batch(5)
+        job = ExportJob.objects.create(user=user_factory())
+
+        job = exports.process_job(exports.claim_next_job())
+        assert job.status == ExportJob.Status.FAILED
+        assert job.error == "connection reset"
+        assert s3.aborted == [f"exports/locations/{job.id}.csv"]
+
+    def test_uploads_typed_parquet_in_row_groups(
+        self, s3, settings, user_factory, location_factory, review_factory
+    ):
+        settings.EXPORT_ROW_GROUP_SIZE = 2
+        location = location_factory(latitude=Decimal("50.450100"), view_count=7)
+        review_factory(location=location, rating=4)
+        location_factory.create_batch(4)
+        job = ExportJob.objects.create(
+            user=user_factory(), format=ExportJob.Format.PARQUET
+        )
+
+        job = exports.process_job(exports.claim_next_job())
+        assert job.status == ExportJob.Status.DONE
+        assert job.object_key.endswith(".parquet")
+        assert job.row_count == 5
+
+        parquet = pq.ParquetFile(io.BytesIO(s3.objects[job.object_key]))
+        assert parquet.metadata.num_row_groups == 3
+        assert parquet.metadata.row_group(0).column(0).compression == "ZSTD"
+        assert parquet.schema_arrow == exports.PARQUET_SCHEMA
+
+        rows = {row["id"]: row for row in parquet.read().to_pylist()}
+        row = rows[str(location.id)]
+        assert row["latitude"] == Decimal("50.450100")
+        assert row["average_rating"] == 4.0
+        assert row["review_count"] == 1
+        assert row["created_at"] == location.created_at
+
+
+@pytest.mark.django_db
+@requires_copy
+class TestCopyFormat:
+
+    def test_copy_matches_python_csv(self, location_factory):
+        location_factory(description="", is_active=False)
+        location_factory(name='Quoted, "name"', description="line\nbreak")
+        location_factory(description="line\rbreak")
+        exact = location_factory()
+        Location.objects.filter(pk=exact.pk).update(
+            created_at=datetime(2024, 1, 2, 3, 4, 5, tzinfo=dt_timezone.utc)
+        )
+        queryset = Location.objects.order_by("id")
+
+        rows = exports.get_csv_queryset(queryset)
+        expected = "".join(exports.iter_csv_rows(rows)).encode()
+
+        file = io.BytesIO()
+        exports.copy_csv(
+            exports.get_raw_connection(queryset.db),
+            exports.get_csv_queryset(queryset, copy=True),
+            file,
+        )
+        assert file.getvalue() == expected
+
+
+class TestCopyExport:
+
+    @pytest.fixture(autouse=True)
+    def raw_connection(self, monkeypatch, settings):
+        settings.EXPORT_COPY_CHUNK_SIZE = 10
+        monkeypatch.setattr(exports, "get_raw_connection", lambda using: None)
+
+    def test_streams_copy_output_in_chunks(self, monkeypatch):
+        rows = [f"row-{index}\n".encode() for index in range(5)]
+        monkeypatch.setattr(exports, "copy_csv", fake_copy(rows))
+
+        chunks = list(exports.iter_copy_csv(Location.objects.values_list("id")))
+        assert b"".join(chunks) == b"".join(rows)
+        assert all(len(chunk) >= 10 for chunk in chunks[:-1])
+
+    def test_copy_error_is_raised_to_consumer(self, monkeypatch):
+        def copy_csv(raw_connection, queryset, file):
+            raise ValueError("COPY failed")
+
+        monkeypatch.setattr(exports, "copy_csv", copy_csv)
+        with pytest.raises(ValueError, match="COPY failed"):
+            list(exports.iter_copy_csv(Location.objects.values_list("id")))
+
+    def test_closed_stream_stops_copy(self, monkeypatch):
+        stopped = []
+
+        def copy_csv(raw_connection, queryset, file):
+            try:
+                while True:
+                    file.write(b"row\n" * 5)
+            except exports.CopyCancelled:
+                stopped.append(True)
+                raise
+
+        monkeypatch.setattr(exports, "copy_csv", copy_csv)
+        stream = exports.iter_copy_csv(Location.objects.values_list("id"))
+        next(stream)
+        stream.close()
+        assert stopped == [True]
@@ -0,0 +1,90 @@
+import io
+
+import orjson
+import pytest
+
+from test_task.locations.imports import (
+    LocationImporter,
+    read_csv,
+    read_geojson,
+    read_ndjson,
+)
+from test_task.locations.models import Location
+
+CSV_HEADER = "name,description,category,latitude,longitude,address\n"
+
+
+def to_csv(*lines):
+    return io.BytesIO((CSV_HEADER + "".join(f"{line}\n" for line in lines)).encode())
+
+
+@pytest.mark.django_db
+class TestLocationImporter:
+
+    def test_creates_valid_rows_in_batches(
+        self, category_factory, django_assert_max_num_queries
+    ):
+        category_factory(name="park")
+        file = to_csv(
+            *(f"Park {n},,park,50.{n},30.{n},Street {n}" for n in range(1, 6))
+        )
+
+        with django_assert_max_num_queries(16):
+            report = LocationImporter(batch_size=2).run(read_csv(file))
+
+        assert report == {"created": 5, "error_count": 0, "errors": []}
+        assert Location.objects.filter(category__name="park").count() == 5
+
+    def test_reports_bad_rows(self, category_factory, location_factory):
+        category_factory(name="park")
+        location_factory(address="Taken street", latitude=10, longitude=10)
+        file = to_csv(
+            "Ok,,park,1,1,Street 1",
+            "Bad latitude,,park,91,1,Street 2",
+            "Unknown category,,zoo,2,2,Street 3",
+            "Address taken,,park,3,3,Taken street",
+            "Point taken,,park,10,10,Street 4",
+            "Duplicate in file,,park,4,4,Street 1",
+        )
+
+        report = LocationImporter(batch_size=2).run(read_csv(file))
+
+        assert report["created"] == 1
+        assert report["error_count"] == 5
+        errors = {error["row"]: error["errors"] for error in report["errors"]}
+        assert set(errors) == {2, 3, 4, 5, 6}
+        assert "latitude" in errors[2]
+        assert "category" in errors[3]
+        assert "address" in errors[4]
+        assert "non_field_errors" in errors[5]
+        assert "address" in errors[6]
+
+    def test_limits_reported_errors(self, category_factory):
+        file = to_csv(*(f"Row {n},,missing,1,{n},Street {n}" for n in range(5)))
+
+        report = LocationImporter(max_errors=2).run(read_csv(file))
+        assert report["error_count"] == 5
+        assert len(report["errors"]) == 2
+
+
+class TestReaders:
+
+    def test_read_ndjson(self):
+        file = io.BytesIO(b'{"name": "a"}\n\nnot json\n')
+        assert list(read_ndjson(file)) == [{"name": "a"}, "not json\n"]
+
+    def test_read_geojson(self):
+        collection = {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "geometry": {"type": "Point", "coordinates": [30.52, 50.45]},
+                    "properties": {"name": "Maidan"},
+                }
+            ],
+        }
+        file = io.BytesIO(orjson.dumps(collection))
+        assert list(read_geojson(file)) == [
+            {"name": "Maidan", "latitude": 50.45, "longitude": 30.52}
+        ]
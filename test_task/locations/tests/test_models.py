@@ -1,5 +1,8 @@
+from datetime import timedelta
+
 import pytest
 from django.db import IntegrityError
+from django.utils import timezone
 
 from test_task.locations.models import Location
 
@@ -26,6 +29,22 @@ class TestLocationQuerySet:
         expected_average_rating = (review_1_star.rating + review_3_star.rating) / 2
         assert location.average_rating == expected_average_rating
 
+    def test_annotate_trending_score(self, location_factory, location_activity_factory):
+        now = timezone.now()
+        location = location_factory()
+        location_activity_factory(location=location, bucket=now, views=5, reviews=1)
+        location_activity_factory(
+            location=location, bucket=now - timedelta(hours=1), views=3, reviews=0
+        )
+        location_activity_factory(
+            location=location, bucket=now - timedelta(days=2), views=100, reviews=10
+        )
+        quiet = location_factory()
+
+        queryset = Location.objects.annotate_trending_score(now - timedelta(days=1))
+        assert queryset.get(pk=location.pk).trending_score == 5 + 10 + 3
+        assert queryset.get(pk=quiet.pk).trending_score == 0
+
     def test_annotate_popularity_score(self, location_factory, review_factory):
         location = location_factory(view_count=1)
         review = review_factory(rating=3, location=location)
@@ -40,6 +59,21 @@ class TestLocationQuerySet:
         expected_popularity_score = round(0.6 * 3 + 0.3 * 1 + 0.1 * 1, 2)
         assert location.popularity_score == expected_popularity_score
 
+    def test_popularity_score_prefers_unique_viewers(
+        self, location_factory, review_factory
+    ):
+        location = location_factory(view_count=1000, unique_viewers=1)
+        review_factory(rating=3, location=location)
+
+        location = (
+            Location.objects.annotate_average_rating()
+            .annotate_review_count()
+            .annotate_popularity_score()
+            .get(pk=location.pk)
+        )
+
+        assert location.popularity_score == round(0.6 * 3 + 0.3 * 1 + 0.1 * 1, 2)
+
     def test_annotate_review_count(self, location_factory, review_factory):
         location = location_factory()
         review_locations = review_factory.create_batch(2, location=location)
@@ -48,6 +82,30 @@ class TestLocationQuerySet:
         location = Location.objects.annotate_review_count().get(pk=location.pk)
         assert location.review_count == len(review_locations)
 
+    def test_annotate_distance(self, location_factory):
+        location = location_factory(latitude=50.4501, longitude=30.5234)
+
+        location = Location.objects.annotate_distance(49.8397, 24.0297).get(
+            pk=location.pk
+        )
+        # Київ - Львів ~ 468 км
+        assert location.distance_m == pytest.approx(468_000, rel=0.01)
+
+    def test_within_bounding_box(self, location_factory):
+        near = location_factory(latitude=50.4501, longitude=30.5234)
+        location_factory(latitude=49.8397, longitude=24.0297)
+
+        queryset = Location.objects.within_bounding_box(50.45, 30.52, 10_000)
+        assert list(queryset) == [near]
+
+    def test_within_bounding_box_across_antimeridian(self, location_factory):
+        east = location_factory(latitude=0, longitude=179.99)
+        west = location_factory(latitude=0, longitude=-179.99)
+        location_factory(latitude=0, longitude=0)
+
+        queryset = Location.objects.within_bounding_box(0, 179.999, 10_000)
+        assert set(queryset) == {east, west}
+
 
 @pytest.mark.django_db
 class TestLocationModel:
@@ -63,3 +121,15 @@ class TestLocationModel:
     def test_str(self, location_factory):
         location = location_factory(name="abc")
         assert str(location) == "abc"
+
+    def test_save_updates_updated_at(self, location_factory):
+        location = location_factory()
+        past = timezone.now() - timedelta(days=1)
+        Location.objects.filter(pk=location.pk).update(created_at=past, updated_at=past)
+        location.refresh_from_db()
+
+        location.name = "renamed"
+        location.save(update_fields=["name"])
+
+        location.refresh_from_db()
+        assert location.updated_at > past
@@ -0,0 +1,120 @@
+import threading
+import time
+import uuid
+
+import pytest
+from scipy.spatial import cKDTree
+
+from test_task.locations import spatial
+from test_task.locations.spatial import LocationIndex
+
+
+@pytest.fixture
+def index():
+    return LocationIndex(rebuild_interval=600)
+
+
+@pytest.mark.django_db
+class TestLocationIndex:
+
+    def test_nearest_orders_by_distance(self, index, location_factory):
+        origin = location_factory(latitude=50.4501, longitude=30.5234, is_active=True)
+        far = location_factory(latitude=49.8397, longitude=24.0297, is_active=True)
+        near = location_factory(latitude=50.4547, longitude=30.5238, is_active=True)
+
+        result = index.nearest(50.4501, 30.5234, k=2, exclude=origin.pk)
+
+        assert [location_id for location_id, _ in result] == [near.pk, far.pk]
+        assert result[0][1] == pytest.approx(512, rel=0.01)
+
+    def test_skips_inactive_locations(self, index, location_factory):
+        location_factory(latitude=50.45, longitude=30.52, is_active=False)
+
+        assert index.nearest(50.45, 30.52, k=5) == []
+
+    def test_applies_updates_without_rebuild(self, index, location_factory):
+        location = location_factory(latitude=10, longitude=10, is_active=True)
+        index.rebuild()
+
+        location.latitude = 50
+        location.longitude = 30
+        index.update(location)
+
+        added = location_factory.build(latitude=50.01, longitude=30, is_active=True)
+        added.id = uuid.uuid4()
+        index.update(added)
+
+        result = index.nearest(50, 30, k=2)
+        assert [location_id for location_id, _ in result] == [location.pk, added.pk]
+        assert len(index) == 1
+
+    def test_soft_deleted_location_is_removed(self, index, location_factory):
+        location = location_factory(latitude=10, longitude=10, is_active=True)
+        index.rebuild()
+
+        location.is_active = False
+        index.update(location)
+
+        assert index.nearest(10, 10, k=1) == []
+
+    def test_stale_index_rebuilds_in_background(self, monkeypatch):
+        index = LocationIndex(rebuild_interval=0)
+        index.rebuild()
+        release = threading.Event()
+        calls = []
+
+        def slow_rebuild():
+            calls.append(1)
+            release.wait(5)
+
+        monkeypatch.setattr(index, "rebuild", slow_rebuild)
+        monkeypatch.setattr(spatial.connections, "close_all", lambda: None)
+
+        # запит не чекає на перебудову і відповідає зі старого дерева
+        assert index.nearest(10, 10, k=1) == []
+        thread = index.schedule_rebuild()
+        assert thread is None
+        assert index.nearest(10, 10, k=1) == []
+
+        release.set()
+        index._build_lock.acquire(timeout=5)
+        index._build_lock.release()
+        assert calls == [1]
+
+    def test_cold_build_runs_once(self, monkeypatch):
+        index = LocationIndex()
+        calls = []
+
+        def slow_rebuild():
+            calls.append(1)
+            time.sleep(0.05)
+            index._built_at = time.monotonic()
+
+        monkeypatch.setattr(index, "rebuild", slow_rebuild)
+        threads = [threading.Thread(target=index.ensure_built) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert calls == [1]
+
+    def test_keeps_updates_made_during_rebuild(
+        self, index, location_factory, monkeypatch
+    ):
+        index.rebuild()
+        added = location_factory.build(latitude=20, longitude=20, is_active=True)
+        added.id = uuid.uuid4()
+
+        def build_tree(points):
+            # оновлення з сигналу прийшло, поки будувалось дерево
+            index.update(added)
+            return cKDTree(points)
+
+        monkeypatch.setattr(spatial, "cKDTree", build_tree)
+        location_factory(latitude=10, longitude=10, is_active=True)
+        index.rebuild()
+
+        assert [location_id for location_id, _ in index.nearest(20, 20, k=1)] == [
+            added.pk
+        ]
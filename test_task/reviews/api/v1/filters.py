@@ -0,0 +1,40 @@
+from django_filters import rest_framework as filters
+from rest_framework import filters as drf_filters
+
+from test_task.reviews.models import Review
+
+
+class ReviewFilterSet(filters.FilterSet):
+    updated_since = filters.IsoDateTimeFilter(
+        field_name="updated_at", lookup_expr="gte"
+    )
+
+    class Meta:
+        model = Review
+        fields = ("updated_since",)
+
+
+class ReviewOrderingFilter(drf_filters.OrderingFilter):
+    # helpful - найкорисніші спершу, -helpful - навпаки; id як tie-breaker
+    # для keyset-пагінації
+    helpful_field = "helpful"
+    helpful_ordering = ["-helpfulness", "-id"]
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+
+        result = []
+        for term in ordering:
+            if term == self.helpful_field:
+                result.extend(self.helpful_ordering)
+            elif term == f"-{self.helpful_field}":
+                result.extend(reverse_term(term) for term in self.helpful_ordering)
+            else:
+                result.append(term)
+        return result
+
+
+def reverse_term(term):
+    return term[1:] if term.startswith("-") else f"-{term}"
@@ -0,0 +1,12 @@
+from test_task.core.pagination import KeysetPagination
+
+from .filters import ReviewOrderingFilter
+
+
+class ReviewHelpfulnessPagination(KeysetPagination):
+    # збігається з індексом (location, -helpfulness, -id); для -helpful
+    # індекс читається у зворотному порядку
+    ordering = ("-helpfulness", "-id")
+
+    def get_ordering(self, request, queryset, view):
+        return ReviewOrderingFilter().get_ordering(request, queryset, view)
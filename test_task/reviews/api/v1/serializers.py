@@ -1,13 +1,13 @@
 from rest_framework import serializers
 
+from test_task.core.serializers import ValuesSerializer, datetime_to_string
+from test_task.reviews.imports import IMPORT_READERS, IMPORTERS
 from test_task.reviews.models import Review, ReviewVote
 from test_task.users.api.v1.serializers import UserNestedSerializer
 
 
 class ReviewListSerializer(serializers.ModelSerializer):
     user = UserNestedSerializer()
-    upvote_count = serializers.IntegerField(default=0)
-    downvote_count = serializers.IntegerField(default=0)
 
     class Meta:
         model = Review
@@ -19,14 +19,32 @@ class ReviewListSerializer(serializers.ModelSerializer):
             "rating",
             "upvote_count",
             "downvote_count",
+            "helpfulness",
+            "updated_at",
         )
         read_only_fields = fields
 
 
+class ReviewListValuesSerializer(ValuesSerializer):
+    fields = {
+        "id": ("id", str),
+        "user": {
+            "id": ("user_id", str),
+            "username": ("user__username", None),
+            "email": ("user__email", None),
+        },
+        "title": ("title", None),
+        "body": ("body", None),
+        "rating": ("rating", None),
+        "upvote_count": ("upvote_count", None),
+        "downvote_count": ("downvote_count", None),
+        "helpfulness": ("helpfulness", None),
+        "updated_at": ("updated_at", datetime_to_string()),
+    }
+
+
 class ReviewRetrieveSerializer(serializers.ModelSerializer):
     user = UserNestedSerializer()
-    upvote_count = serializers.IntegerField(default=0)
-    downvote_count = serializers.IntegerField(default=0)
 
     class Meta:
         model = Review
@@ -38,6 +56,8 @@ class ReviewRetrieveSerializer(serializers.ModelSerializer):
             "rating",
             "upvote_count",
             "downvote_count",
+            "helpfulness",
+            "updated_at",
         )
         read_only_fields = fields
 
@@ -74,3 +94,20 @@ class ReviewVoteUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = ReviewVote
         fields = ("vote",)
+
+
+class ReviewImportSerializer(serializers.Serializer):
+    kind = serializers.ChoiceField(choices=sorted(IMPORTERS))
+    file = serializers.FileField()
+    format = serializers.ChoiceField(choices=sorted(IMPORT_READERS), required=False)
+
+    def validate(self, attrs):
+        if "format" not in attrs:
+            # формат за розширенням файлу
+            extension = attrs["file"].name.rpartition(".")[2].lower()
+            if extension not in IMPORT_READERS:
+                raise serializers.ValidationError(
+                    {"format": ["Cannot guess the format from the file name."]}
+                )
+            attrs["format"] = extension
+        return attrs
@@ -1,58 +1,125 @@
 from django.conf import settings
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
-from rest_framework import generics, permissions
-
 from django.core.cache import cache
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import generics, permissions, response
 
+from .filters import ReviewFilterSet, ReviewOrderingFilter
+from .pagination import ReviewHelpfulnessPagination
 from .permissions import IsUser
 from .serializers import (
     ReviewListSerializer,
+    ReviewListValuesSerializer,
     ReviewCreateSerializer,
+    ReviewImportSerializer,
     ReviewRetrieveSerializer,
     ReviewUpdateSerializer,
     ReviewVoteCreateSerializer,
     ReviewVoteUpdateSerializer,
 )
+from test_task.core.cache import (
+    get_namespace_version,
+    make_list_cache_key,
+    request_fingerprint,
+    review_list_namespace,
+)
+from test_task.core.views import ConditionalGetMixin, LeanSerializerMixin
+from test_task.reviews.imports import IMPORT_READERS, IMPORTERS
 from test_task.reviews.models import Review, ReviewVote
+from test_task.reviews.services import (
+    invalidate_location_reviews,
+    invalidate_review_list,
+    record_review_activity,
+)
 
 
 class ReviewQuerySetMixin:
 
+    def get_etag_parts(self):
+        namespace = review_list_namespace(self.kwargs["location_id"])
+        return (namespace, get_namespace_version(namespace))
+
     def get_queryset(self):
         queryset = Review.objects.filter(location_id=self.kwargs["location_id"])
-        queryset = queryset.select_related("location", "user")
-        queryset = queryset.prefetch_related("votes")
-        queryset = queryset.annotate_upvote_count()
-        queryset = queryset.annotate_downvote_count()
-        return queryset
+        # лічильники голосів денормалізовані, join по votes не потрібен
+        return queryset.select_related("location", "user")
 
 
-class ReviewListCreateAPIView(ReviewQuerySetMixin, generics.ListCreateAPIView):
+class ReviewListCreateAPIView(
+    ReviewQuerySetMixin,
+    ConditionalGetMixin,
+    LeanSerializerMixin,
+    generics.ListCreateAPIView,
+):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    filter_backends = [DjangoFilterBackend, ReviewOrderingFilter]
+    filterset_class = ReviewFilterSet
+    ordering_fields = ("created_at", "rating", "helpful")
+    lean_serializer_class = ReviewListValuesSerializer
+
+    @property
+    def paginator(self):
+        # глибокі сторінки "найкорисніших" - по ключу, а не через OFFSET
+        ordering = self.request.query_params.get("ordering", "")
+        if ordering.strip().lstrip("-") == ReviewOrderingFilter.helpful_field:
+            self.pagination_class = ReviewHelpfulnessPagination
+        return super().paginator
 
-    @method_decorator(cache_page(settings.CACHE_TTL, key_prefix="review_list"))
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        not_modified = self.check_not_modified(request)
+        if not_modified is not None:
+            return not_modified
+
+        cache_key = make_list_cache_key(
+            review_list_namespace(self.kwargs["location_id"]), request
+        )
+        data = cache.get(cache_key)
+        if data is None:
+            data = self.get_list_data()
+            cache.set(cache_key, data, settings.CACHE_TTL)
+        return response.Response(data)
+
+    def get_list_data(self):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        lean_serializer = self.get_lean_serializer(queryset)
+        if lean_serializer is not None:
+            queryset = lean_serializer.get_queryset(queryset)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            data = self.serialize_rows(page, lean_serializer)
+            return self.get_paginated_response(data).data
+        return self.serialize_rows(queryset, lean_serializer)
 
     def get_serializer_class(self):
         if self.request.method == "POST":
             return ReviewCreateSerializer
         return ReviewListSerializer
 
+    def get_etag_parts(self):
+        return (*super().get_etag_parts(), request_fingerprint(self.request))
+
     def perform_create(self, serializer):
         serializer.save(
             user=self.request.user,
             location_id=self.kwargs["location_id"],
         )
-        try:
-            cache.delete_pattern("*location_list*")
-            cache.delete_pattern("*review_list*")
-        except AttributeError:
-            pass
+        invalidate_location_reviews(self.kwargs["location_id"])
+        record_review_activity(self.kwargs["location_id"])
 
 
-class ReviewDetailAPIView(ReviewQuerySetMixin, generics.RetrieveUpdateDestroyAPIView):
+class ReviewDetailAPIView(
+    ReviewQuerySetMixin, ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView
+):
+
+    def retrieve(self, request, *args, **kwargs):
+        not_modified = self.check_not_modified(request)
+        if not_modified is not None:
+            return not_modified
+        return super().retrieve(request, *args, **kwargs)
+
+    def get_etag_parts(self):
+        return (*super().get_etag_parts(), self.kwargs["pk"])
 
     def get_serializer_class(self):
         if self.request.method in permissions.SAFE_METHODS:
@@ -70,19 +137,11 @@ class ReviewDetailAPIView(ReviewQuerySetMixin, generics.RetrieveUpdateDestroyAPI
 
     def perform_update(self, serializer):
         super().perform_update(serializer)
-        try:
-            cache.delete_pattern("*location_list*")
-            cache.delete_pattern("*review_list*")
-        except AttributeError:
-            pass
+        invalidate_location_reviews(serializer.instance.location_id)
 
     def perform_destroy(self, instance):
         super().perform_destroy(instance)
-        try:
-            cache.delete_pattern("*location_list*")
-            cache.delete_pattern("*review_list*")
-        except AttributeError:
-            pass
+        invalidate_location_reviews(instance.location_id)
 
 
 class ReviewVoteCreateAPIView(generics.CreateAPIView):
@@ -90,15 +149,11 @@ class ReviewVoteCreateAPIView(generics.CreateAPIView):
     serializer_class = ReviewVoteCreateSerializer
 
     def perform_create(self, serializer):
-        serializer.save(
+        vote = serializer.save(
             user=self.request.user,
             review_id=self.kwargs["review_id"],
         )
-        try:
-            cache.delete_pattern("*location_list*")
-            cache.delete_pattern("*review_list*")
-        except AttributeError:
-            pass
+        invalidate_review_list(vote.review.location_id)
 
 
 class ReviewVoteDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
@@ -113,8 +168,23 @@ class ReviewVoteDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
 
     def perform_update(self, serializer):
         super().perform_update(serializer)
-        try:
-            cache.delete_pattern("*location_list*")
-            cache.delete_pattern("*review_list*")
-        except AttributeError:
-            pass
+        invalidate_review_list(serializer.instance.review.location_id)
+
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        invalidate_review_list(instance.review.location_id)
+
+
+class ReviewImportAPIView(generics.GenericAPIView):
+    # міграція відгуків і голосів з партнерських платформ, як import_reviews
+    permission_classes = [permissions.IsAdminUser]
+    serializer_class = ReviewImportSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        data = serializer.validated_data
+        read = IMPORT_READERS[data["format"]]
+        report = IMPORTERS[data["kind"]]().run(read(data["file"]))
+        return response.Response(report)
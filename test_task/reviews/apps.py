@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ReviewsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "test_task.reviews"
+
+    def ready(self):
+        from test_task.reviews import signals  # noqa: F401
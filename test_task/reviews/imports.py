@@ -0,0 +1,182 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from rest_framework import serializers
+
+from test_task.core.imports import BatchImporter, read_csv, read_ndjson
+from test_task.locations.models import Location
+from test_task.reviews.models import Review, ReviewVote
+from test_task.reviews.services import (
+    invalidate_location_reviews_many,
+    invalidate_review_lists,
+)
+
+User = get_user_model()
+
+IMPORT_READERS = {
+    "csv": read_csv,
+    "ndjson": read_ndjson,
+}
+
+
+class ReviewImportRowSerializer(serializers.Serializer):
+    location = serializers.UUIDField()
+    user = serializers.UUIDField()
+    title = serializers.CharField(max_length=255)
+    body = serializers.CharField(max_length=2000)
+    rating = serializers.IntegerField(
+        min_value=Review.MIN_RATING, max_value=Review.MAX_RATING
+    )
+
+
+class ReviewVoteImportRowSerializer(serializers.Serializer):
+    # відгук - за id або за парою (location, author), яка в нього унікальна
+    review = serializers.UUIDField(required=False)
+    location = serializers.UUIDField(required=False)
+    author = serializers.UUIDField(required=False)
+    user = serializers.UUIDField()
+    vote = serializers.ChoiceField(choices=ReviewVote.Vote.choices)
+
+    def validate(self, attrs):
+        if "review" not in attrs and not {"location", "author"} <= set(attrs):
+            raise serializers.ValidationError(
+                "Either `review` or `location` and `author` are required."
+            )
+        return attrs
+
+
+def get_existing_ids(model, ids):
+    return set(model.objects.filter(pk__in=ids).values_list("pk", flat=True))
+
+
+class ReviewImporter(BatchImporter):
+    # Upsert через INSERT ... ON CONFLICT (location, user) DO UPDATE: повторний
+    # імпорт того ж файлу оновлює відгуки, а не падає. Кеші скидаються один
+    # раз на пачку. В trending імпорт не рахується - це не нова активність.
+    row_serializer_class = ReviewImportRowSerializer
+
+    def __init__(self, batch_size=None, max_errors=None):
+        super().__init__(batch_size, max_errors)
+        self.imported = 0
+
+    def get_report(self):
+        return {"imported": self.imported, **super().get_report()}
+
+    def import_batch(self, valid):
+        locations = get_existing_ids(Location, {data["location"] for _, data in valid})
+        users = get_existing_ids(User, {data["user"] for _, data in valid})
+
+        # ON CONFLICT не може оновити рядок двічі в одному INSERT:
+        # для повторів у пачці перемагає останній рядок
+        reviews = {}
+        for row_number, data in valid:
+            errors = {}
+            if data["location"] not in locations:
+                errors["location"] = ["Location does not exist."]
+            if data["user"] not in users:
+                errors["user"] = ["User does not exist."]
+            if errors:
+                self.add_error(row_number, errors)
+                continue
+
+            reviews[data["location"], data["user"]] = Review(
+                location_id=data["location"],
+                user_id=data["user"],
+                title=data["title"],
+                body=data["body"],
+                rating=data["rating"],
+            )
+
+        if not reviews:
+            return
+        with transaction.atomic():
+            Review.objects.bulk_create(
+                reviews.values(),
+                batch_size=self.batch_size,
+                update_conflicts=True,
+                unique_fields=("location", "user"),
+                update_fields=("title", "body", "rating", "updated_at"),
+            )
+            invalidate_location_reviews_many({location for location, _ in reviews})
+        self.imported += len(reviews)
+
+
+class ReviewVoteImporter(BatchImporter):
+    # Upsert голосів по (review, user); кеш списків відгуків скидається
+    # один раз на пачку для кожної зачепленої локації
+    row_serializer_class = ReviewVoteImportRowSerializer
+
+    def __init__(self, batch_size=None, max_errors=None):
+        super().__init__(batch_size, max_errors)
+        self.imported = 0
+
+    def get_report(self):
+        return {"imported": self.imported, **super().get_report()}
+
+    def import_batch(self, valid):
+        review_locations, reviews_by_author = self.resolve_reviews(
+            [data for _, data in valid]
+        )
+        users = get_existing_ids(User, {data["user"] for _, data in valid})
+
+        votes = {}
+        for row_number, data in valid:
+            review_id = data.get("review")
+            if review_id is None:
+                review_id = reviews_by_author.get((data["location"], data["author"]))
+
+            errors = {}
+            if review_id not in review_locations:
+                errors["review"] = ["Review does not exist."]
+            if data["user"] not in users:
+                errors["user"] = ["User does not exist."]
+            if errors:
+                self.add_error(row_number, errors)
+                continue
+
+            votes[review_id, data["user"]] = ReviewVote(
+                review_id=review_id, user_id=data["user"], vote=data["vote"]
+            )
+
+        if not votes:
+            return
+        with transaction.atomic():
+            ReviewVote.objects.bulk_create(
+                votes.values(),
+                batch_size=self.batch_size,
+                update_conflicts=True,
+                unique_fields=("review", "user"),
+                update_fields=("vote", "updated_at"),
+            )
+            # bulk_create не шле сигналів: лічильники перераховуємо пачкою
+            Review.objects.filter(
+                pk__in={review_id for review_id, _ in votes}
+            ).refresh_vote_counts()
+            invalidate_review_lists(
+                {review_locations[review_id] for review_id, _ in votes}
+            )
+        self.imported += len(votes)
+
+    def resolve_reviews(self, rows):
+        # review_id -> location_id і (location, author) -> review_id
+        review_ids = {data["review"] for data in rows if "review" in data}
+        pairs = {
+            (data["location"], data["author"]) for data in rows if "review" not in data
+        }
+
+        review_locations = dict(
+            Review.objects.filter(pk__in=review_ids).values_list("pk", "location_id")
+        )
+        reviews_by_author = {}
+        if pairs:
+            candidates = Review.objects.filter(
+                location_id__in={location for location, _ in pairs},
+                user_id__in={author for _, author in pairs},
+            ).values_list("pk", "location_id", "user_id")
+            for review_id, location_id, author_id in candidates:
+                if (location_id, author_id) in pairs:
+                    review_locations[review_id] = location_id
+                    reviews_by_author[location_id, author_id] = review_id
+        return review_locations, reviews_by_author
+
+
+IMPORTERS = {"reviews": ReviewImporter, "votes": ReviewVoteImporter}
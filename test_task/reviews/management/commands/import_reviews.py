@@ -0,0 +1,35 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from test_task.reviews.imports import IMPORT_READERS, IMPORTERS
+
+
+class Command(BaseCommand):
+    help = "Upserts reviews or review votes from a CSV or NDJSON file in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(IMPORTERS))
+        parser.add_argument("path", type=Path)
+        parser.add_argument(
+            "--format",
+            choices=sorted(IMPORT_READERS),
+            help="Input format; guessed from the file extension by default.",
+        )
+        parser.add_argument("--batch-size", type=int)
+
+    def handle(self, *args, kind, path, format, batch_size, **options):
+        format = format or path.suffix.lstrip(".").lower()
+        if format not in IMPORT_READERS:
+            raise CommandError(f"Unknown format `{format}`, use --format.")
+
+        importer = IMPORTERS[kind](batch_size=batch_size)
+        with path.open("rb") as file:
+            report = importer.run(IMPORT_READERS[format](file))
+
+        for error in report["errors"]:
+            self.stderr.write(f"Row {error['row']}: {dict(error['errors'])}")
+        self.stdout.write(
+            f"Imported {report['imported']} {kind}, "
+            f"{report['error_count']} rows failed."
+        )
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from test_task.reviews.models import Review
+from test_task.reviews.services import invalidate_review_lists
+
+
+class Command(BaseCommand):
+    help = "Recomputes denormalized review vote counts that drifted from votes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, batch_size, **options):
+        drifted = list(
+            Review.objects.annotate_actual_upvote_count()
+            .annotate_actual_downvote_count()
+            .exclude(
+                upvote_count=F("actual_upvote_count"),
+                downvote_count=F("actual_downvote_count"),
+            )
+            .order_by()
+            .values_list("pk", "location_id")
+        )
+
+        for start in range(0, len(drifted), batch_size):
+            batch = drifted[start : start + batch_size]
+            Review.objects.filter(
+                pk__in=[review_id for review_id, _ in batch]
+            ).refresh_vote_counts()
+        invalidate_review_lists(location_id for _, location_id in drifted)
+
+        self.stdout.write(f"Fixed vote counts of {len(drifted)} reviews.")
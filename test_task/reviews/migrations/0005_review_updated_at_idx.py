@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("locations", "0009_location_updated_at_idx"),
+        ("reviews", "0004_reviewvote_reviews_rev_user_id_adb81b_idx_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["updated_at"], name="reviews_rev_updated_3ebe01_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:41
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_vote_counts(apps, schema_editor):
+    Review = apps.get_model("reviews", "Review")
+    ReviewVote = apps.get_model("reviews", "ReviewVote")
+
+    def count(vote):
+        return Coalesce(
+            Subquery(
+                ReviewVote.objects.filter(review=OuterRef("pk"), vote=vote)
+                .order_by()
+                .values("review")
+                .annotate(count=Count("pk"))
+                .values("count"),
+                output_field=IntegerField(),
+            ),
+            0,
+        )
+
+    Review.objects.update(upvote_count=count(1), downvote_count=count(-1))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews", "0005_review_updated_at_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="review",
+            name="downvote_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="review",
+            name="upvote_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_vote_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:43
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Cast, Coalesce, NullIf, Sqrt
+
+
+def backfill_helpfulness(apps, schema_editor):
+    # копія wilson_lower_bound на момент міграції (z=1.96), щоб зміни в
+    # моделях не міняли результат повторного прогону
+    Review = apps.get_model("reviews", "Review")
+    z = 1.96
+    z2 = z * z
+    total = NullIf(
+        Cast(F("upvote_count") + F("downvote_count"), FloatField()), Value(0.0)
+    )
+    share = Cast(F("upvote_count"), FloatField()) / total
+    score = (
+        share
+        + Value(z2 / 2) / total
+        - Value(z)
+        * Sqrt((share * (Value(1.0) - share) + Value(z2 / 4) / total) / total)
+    ) / (Value(1.0) + Value(z2) / total)
+    Review.objects.update(
+        helpfulness=Coalesce(score, Value(0.0), output_field=FloatField())
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("locations", "0009_location_updated_at_idx"),
+        ("reviews", "0006_review_vote_counts"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="review",
+            name="helpfulness",
+            field=models.FloatField(default=0),
+        ),
+        migrations.RunPython(backfill_helpfulness, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["location", "-helpfulness", "-id"],
+                name="reviews_rev_locatio_855bcb_idx",
+            ),
+        ),
+    ]
@@ -5,7 +5,20 @@ from django.core.validators import (
 )
 from django.db import models
 from django.contrib.auth import get_user_model
-from django.db.models import Count, Q, IntegerField
+from django.utils import timezone
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    FloatField,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast, Coalesce, Greatest, NullIf, Sqrt
 
 from test_task.core.models import UUIDModel, TimestampedModel
 from test_task.locations.models import Location
@@ -14,25 +27,90 @@ User = get_user_model()
 
 
 class ReviewQuerySet(models.QuerySet):
+    # actual_* рахуються по ReviewVote join'ом; у відповідях API
+    # використовуються денормалізовані upvote_count/downvote_count
 
-    def annotate_upvote_count(self):
+    def annotate_actual_upvote_count(self):
         return self.annotate(
-            upvote_count=Count(
+            actual_upvote_count=Count(
                 "votes",
                 Q(votes__vote=ReviewVote.Vote.UPVOTE),
                 output_field=IntegerField(),
             )
         )
 
-    def annotate_downvote_count(self):
+    def annotate_actual_downvote_count(self):
         return self.annotate(
-            upvote_count=Count(
+            actual_downvote_count=Count(
                 "votes",
                 Q(votes__vote=ReviewVote.Vote.DOWNVOTE),
                 output_field=IntegerField(),
             )
         )
 
+    def shift_vote_counts(self, old_vote=None, new_vote=None):
+        # атомарний UPDATE ... SET count = count +/- 1 без читання рядка;
+        # helpfulness рахується в тому ж UPDATE з нових значень. Лічильники
+        # є у відповіді API, тож updated_at теж рухається для updated_since
+        if old_vote == new_vote:
+            return 0
+
+        counts = {field: F(field) for field in VOTE_COUNT_FIELDS.values()}
+        if old_vote is not None:
+            field = VOTE_COUNT_FIELDS[old_vote]
+            counts[field] = Greatest(F(field) - 1, Value(0))
+        if new_vote is not None:
+            field = VOTE_COUNT_FIELDS[new_vote]
+            counts[field] = F(field) + 1
+        return self.update(
+            **counts,
+            helpfulness=wilson_lower_bound(**counts),
+            updated_at=timezone.now(),
+        )
+
+    def refresh_vote_counts(self):
+        # перераховує лічильники з ReviewVote: після bulk-операцій і reconcile
+        counts = {
+            field: Coalesce(
+                Subquery(
+                    ReviewVote.objects.filter(review=OuterRef("pk"), vote=vote)
+                    .order_by()
+                    .values("review")
+                    .annotate(count=Count("pk"))
+                    .values("count"),
+                    output_field=IntegerField(),
+                ),
+                0,
+            )
+            for vote, field in VOTE_COUNT_FIELDS.items()
+        }
+        # updated_at рухаємо лише там, де лічильники справді змінились,
+        # щоб reconcile не робив усі відгуки "зміненими"
+        unchanged = Q(**{field: value for field, value in counts.items()})
+        return self.update(
+            **counts,
+            helpfulness=wilson_lower_bound(**counts),
+            updated_at=Case(
+                When(unchanged, then=F("updated_at")),
+                default=Value(timezone.now()),
+            ),
+        )
+
+
+def wilson_lower_bound(upvote_count, downvote_count, z=1.96):
+    # Нижня межа 95% інтервалу Вільсона для частки upvote: 1 з 1 "за"
+    # ранжується нижче, ніж 90 зі 100. Без голосів - 0.
+    total = NullIf(Cast(upvote_count + downvote_count, FloatField()), Value(0.0))
+    share = Cast(upvote_count, FloatField()) / total
+    z2 = z * z
+    score = (
+        share
+        + Value(z2 / 2) / total
+        - Value(z)
+        * Sqrt((share * (Value(1.0) - share) + Value(z2 / 4) / total) / total)
+    ) / (Value(1.0) + Value(z2) / total)
+    return Coalesce(score, Value(0.0), output_field=FloatField())
+
 
 class Review(UUIDModel, TimestampedModel):
     MIN_RATING = 1
@@ -56,6 +134,11 @@ class Review(UUIDModel, TimestampedModel):
             MaxValueValidator(MAX_RATING),
         ]
     )
+    # денормалізовані лічильники голосів, див. signals.py
+    upvote_count = models.PositiveIntegerField(default=0)
+    downvote_count = models.PositiveIntegerField(default=0)
+    # wilson_lower_bound() від лічильників, для ordering=helpful
+    helpfulness = models.FloatField(default=0)
 
     objects = ReviewQuerySet.as_manager()
 
@@ -68,6 +151,8 @@ class Review(UUIDModel, TimestampedModel):
             models.Index(fields=("body",)),
             models.Index(fields=("rating",)),
             models.Index(fields=("created_at",)),
+            models.Index(fields=("updated_at",)),
+            models.Index(fields=("location", "-helpfulness", "-id")),
         ]
 
     def __str__(self):
@@ -83,6 +168,9 @@ class ReviewVote(UUIDModel, TimestampedModel):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="votes")
     vote = models.SmallIntegerField(choices=Vote.choices)
 
+    # значення vote в базі; сигнали за ним рахують зсув лічильників Review
+    saved_vote = None
+
     class Meta:
         unique_together = ("review", "user")
         indexes = [
@@ -90,6 +178,18 @@ class ReviewVote(UUIDModel, TimestampedModel):
             models.Index(fields=("vote",)),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.saved_vote = instance.__dict__.get("vote")
+        return instance
+
     def __str__(self):
         vote_display = self.get_vote_display()
         return f"{self.user.username} {vote_display}d {self.review.title}"
+
+
+VOTE_COUNT_FIELDS = {
+    ReviewVote.Vote.UPVOTE: "upvote_count",
+    ReviewVote.Vote.DOWNVOTE: "downvote_count",
+}
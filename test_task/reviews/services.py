@@ -0,0 +1,51 @@
+from django.db import transaction
+
+from test_task.core.cache import (
+    LOCATION_LIST_NAMESPACE,
+    bump_namespace_version,
+    location_namespace,
+    review_list_namespace,
+)
+from test_task.locations.counters import activity_counter
+
+
+def invalidate_review_list(location_id):
+    transaction.on_commit(
+        lambda: bump_namespace_version(review_list_namespace(location_id))
+    )
+
+
+def invalidate_location_reviews(location_id):
+    # рейтинг і кількість відгуків змінились - скидаємо і список локацій
+    invalidate_review_list(location_id)
+    transaction.on_commit(lambda: bump_namespace_version(LOCATION_LIST_NAMESPACE))
+    transaction.on_commit(
+        lambda: bump_namespace_version(location_namespace(location_id))
+    )
+
+
+def record_review_activity(location_id):
+    transaction.on_commit(lambda: activity_counter.record(location_id, "reviews"))
+
+
+def invalidate_review_lists(location_ids):
+    location_ids = set(location_ids)
+
+    def bump():
+        for location_id in location_ids:
+            bump_namespace_version(review_list_namespace(location_id))
+
+    transaction.on_commit(bump)
+
+
+def invalidate_location_reviews_many(location_ids):
+    # масові зміни: список локацій скидаємо один раз на всю пачку
+    location_ids = set(location_ids)
+    invalidate_review_lists(location_ids)
+
+    def bump():
+        bump_namespace_version(LOCATION_LIST_NAMESPACE)
+        for location_id in location_ids:
+            bump_namespace_version(location_namespace(location_id))
+
+    transaction.on_commit(bump)
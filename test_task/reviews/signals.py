@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from test_task.reviews.models import Review, ReviewVote
+
+
+@receiver(post_save, sender=ReviewVote)
+def shift_vote_counts_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old_vote = None if created else instance.saved_vote
+    Review.objects.filter(pk=instance.review_id).shift_vote_counts(
+        old_vote, instance.vote
+    )
+    instance.saved_vote = instance.vote
+
+
+@receiver(post_delete, sender=ReviewVote)
+def shift_vote_counts_on_delete(sender, instance, **kwargs):
+    old_vote = instance.saved_vote if instance.saved_vote is not None else instance.vote
+    Review.objects.filter(pk=instance.review_id).shift_vote_counts(old_vote, None)
@@ -0,0 +1,35 @@
+import json
+
+import pytest
+from rest_framework.utils.encoders import JSONEncoder
+
+from test_task.reviews.api.v1.serializers import (
+    ReviewListSerializer,
+    ReviewListValuesSerializer,
+)
+from test_task.reviews.models import Review
+
+
+def to_json(data):
+    return json.loads(json.dumps(data, cls=JSONEncoder))
+
+
+@pytest.mark.django_db
+class TestReviewListValuesSerializer:
+
+    def test_matches_model_serializer(self, review_factory, review_vote_factory):
+        review = review_factory()
+        review_vote_factory.create_batch(2, review=review, upvote=True)
+        review_vote_factory(review=review, downvote=True)
+        review_factory.create_batch(2)
+
+        queryset = Review.objects.select_related("user")
+
+        expected = ReviewListSerializer(queryset, many=True).data
+        lean_serializer = ReviewListValuesSerializer(queryset)
+        actual = lean_serializer.to_representation(
+            lean_serializer.get_queryset(queryset)
+        )
+
+        assert to_json(actual) == to_json(expected)
+        assert [list(row) for row in actual] == [list(row) for row in expected]
@@ -1,7 +1,14 @@
+import base64
+import io
+from datetime import timedelta
+
+import orjson
 import pytest
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.reverse import reverse
 
+from test_task.reviews.api.v1.pagination import ReviewHelpfulnessPagination
 from test_task.reviews.models import Review, ReviewVote
 
 
@@ -95,6 +102,15 @@ class TestReviewListCreateAPIView:
         assert review.user_id == user.pk
         assert review.location_id == location.pk
 
+    def test_create_with_json_body(self, api_client, review_list_url, user_factory):
+        api_client.force_authenticate(user=user_factory())
+
+        data = {"title": "test title", "body": "тест", "rating": 3}
+        response = api_client.post(review_list_url, data, format="json")
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response["Content-Type"] == "application/json"
+        assert response.json()["body"] == "тест"
+
     def test_lists_reviews_only_of_specified_location(
         self, api_client, review_list_url, location, review_factory
     ):
@@ -106,6 +122,207 @@ class TestReviewListCreateAPIView:
         assert response.data["count"] == 1
         assert response.data["results"][0]["id"] == str(expected_review.id)
 
+    def test_updated_since(self, api_client, review_list_url, location, review_factory):
+        past = timezone.now() - timedelta(days=1)
+        unchanged = review_factory(location=location)
+        changed = review_factory(location=location)
+        Review.objects.filter(pk=unchanged.pk).update(created_at=past, updated_at=past)
+
+        response = api_client.get(
+            review_list_url, {"updated_since": (past + timedelta(hours=1)).isoformat()}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert [review["id"] for review in response.data["results"]] == [
+            str(changed.id)
+        ]
+
+    def test_updated_since_includes_new_votes(
+        self, api_client, review_list_url, location, review_factory, review_vote_factory
+    ):
+        past = timezone.now() - timedelta(days=1)
+        review = review_factory(location=location)
+        Review.objects.filter(pk=review.pk).update(created_at=past, updated_at=past)
+        review_vote_factory(review=review, upvote=True)
+
+        response = api_client.get(
+            review_list_url, {"updated_since": (past + timedelta(hours=1)).isoformat()}
+        )
+        assert [
+            (item["id"], item["upvote_count"]) for item in response.data["results"]
+        ] == [(str(review.id), 1)]
+
+    @pytest.mark.parametrize(
+        "ordering, expected_ordering",
+        [
+            ("helpful", ("-helpfulness", "-id")),
+            ("-helpful", ("helpfulness", "id")),
+        ],
+    )
+    @pytest.mark.parametrize("lean", [False, True])
+    def test_order_by_helpful_with_keyset_pages(
+        self,
+        api_client,
+        review_list_url,
+        location,
+        review_factory,
+        review_vote_factory,
+        monkeypatch,
+        settings,
+        lean,
+        ordering,
+        expected_ordering,
+    ):
+        settings.LEAN_SERIALIZERS = lean
+        monkeypatch.setattr(ReviewHelpfulnessPagination, "page_size", 2)
+        # два відгуки без голосів: порядок між ними вирішує id
+        reviews = review_factory.create_batch(6, location=location)
+        for upvotes, review in enumerate(reviews[1:]):
+            review_vote_factory.create_batch(upvotes, review=review, upvote=True)
+
+        ids = []
+        url = f"{review_list_url}?ordering={ordering}"
+        while url:
+            response = api_client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert len(response.data["results"]) <= 2
+            ids.extend(review["id"] for review in response.data["results"])
+            url = response.data["next"]
+
+        expected = Review.objects.order_by(*expected_ordering).values_list(
+            "id", flat=True
+        )
+        assert ids == [str(review_id) for review_id in expected]
+        if ordering == "helpful":
+            assert ids[0] == str(reviews[-1].id)
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            "garbage",
+            base64.urlsafe_b64encode(orjson.dumps(["abc", "zzz"])).decode(),
+            base64.urlsafe_b64encode(orjson.dumps([0.5, "not-a-uuid"])).decode(),
+            base64.urlsafe_b64encode(orjson.dumps([None, None])).decode(),
+            base64.urlsafe_b64encode(orjson.dumps([0.5])).decode(),
+        ],
+    )
+    def test_invalid_cursor(self, api_client, review_list_url, review_factory, cursor):
+        review_factory()
+        response = api_client.get(
+            review_list_url, {"ordering": "helpful", "cursor": cursor}
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_lean_serializer(
+        self, api_client, review_list_url, location, review_factory, settings
+    ):
+        settings.LEAN_SERIALIZERS = True
+        expected_review = review_factory(location=location)
+
+        response = api_client.get(review_list_url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 1
+        assert response.data["results"][0]["id"] == str(expected_review.id)
+        assert response.data["results"][0]["user"]["id"] == str(expected_review.user_id)
+
+    def test_list_is_cached_until_review_is_created(
+        self,
+        api_client,
+        review_list_url,
+        user_factory,
+        review_factory,
+        location,
+        locmem_cache,
+        django_capture_on_commit_callbacks,
+    ):
+        review_factory(location=location)
+        response = api_client.get(review_list_url)
+        assert response.data["count"] == 1
+
+        review_factory(location=location)
+        response = api_client.get(review_list_url)
+        assert response.data["count"] == 1
+
+        api_client.force_authenticate(user=user_factory())
+        data = {"title": "test title", "body": "test body", "rating": 3}
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post(review_list_url, data)
+
+        response = api_client.get(review_list_url)
+        assert response.data["count"] == 3
+
+    def test_not_modified(
+        self,
+        api_client,
+        review_list_url,
+        review,
+        review_vote_create_url,
+        user_factory,
+        locmem_cache,
+        django_capture_on_commit_callbacks,
+    ):
+        etag = api_client.get(review_list_url)["ETag"]
+
+        response = api_client.get(review_list_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        api_client.force_authenticate(user=user_factory())
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post(review_vote_create_url, {"vote": ReviewVote.Vote.UPVOTE})
+
+        response = api_client.get(review_list_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_vote_on_other_location_keeps_cache(
+        self,
+        api_client,
+        review_list_url,
+        user_factory,
+        review_factory,
+        location,
+        locmem_cache,
+        django_capture_on_commit_callbacks,
+    ):
+        review_factory(location=location)
+        api_client.get(review_list_url)
+        review_factory(location=location)
+
+        other_review = review_factory()
+        api_client.force_authenticate(user=user_factory())
+        url = reverse("v1:review_vote_create", kwargs={"review_id": other_review.pk})
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post(url, {"vote": ReviewVote.Vote.UPVOTE})
+
+        response = api_client.get(review_list_url)
+        assert response.data["count"] == 1
+
+    def test_vote_invalidates_after_commit(
+        self,
+        api_client,
+        review_list_url,
+        user_factory,
+        review,
+        review_factory,
+        locmem_cache,
+        django_capture_on_commit_callbacks,
+    ):
+        response = api_client.get(review_list_url)
+        assert response.data["count"] == 1
+        review_factory(location=review.location)
+
+        api_client.force_authenticate(user=user_factory())
+        url = reverse("v1:review_vote_create", kwargs={"review_id": review.pk})
+        with django_capture_on_commit_callbacks() as callbacks:
+            api_client.post(url, {"vote": ReviewVote.Vote.UPVOTE})
+
+            response = api_client.get(review_list_url)
+            assert response.data["count"] == 1
+
+        for callback in callbacks:
+            callback()
+
+        response = api_client.get(review_list_url)
+        assert response.data["count"] == 2
+
 
 @pytest.mark.django_db
 class TestReviewDetailAPIview:
@@ -159,6 +376,12 @@ class TestReviewDetailAPIview:
         response = getattr(api_client, method)(review_detail_url)
         assert response.status_code == expected_status_code
 
+    def test_not_modified(self, api_client, review_detail_url, locmem_cache):
+        etag = api_client.get(review_detail_url)["ETag"]
+
+        response = api_client.get(review_detail_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
 
 @pytest.mark.django_db
 class TestReviewVoteCreateAPIView:
@@ -276,3 +499,31 @@ class TestReviewVoteDetailAPIView:
         data = {"vote": ReviewVote.Vote.DOWNVOTE}
         response = getattr(api_client, method)(review_vote_detail_url, data)
         assert response.status_code == expected_status_code
+
+
+@pytest.mark.django_db
+class TestReviewImportAPIView:
+
+    @pytest.fixture
+    def import_url(self):
+        return reverse("v1:review_import")
+
+    def test_admin_only(self, api_client, import_url, user_factory):
+        api_client.force_authenticate(user=user_factory())
+        response = api_client.post(import_url, {}, format="multipart")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_imports_votes_csv(
+        self, api_client, import_url, user_factory, review, location
+    ):
+        voter = user_factory()
+        api_client.force_authenticate(user=user_factory(is_staff=True))
+        file = io.BytesIO(f"review,user,vote\n{review.pk},{voter.pk},1\n".encode())
+        file.name = "votes.csv"
+
+        response = api_client.post(
+            import_url, {"kind": "votes", "file": file}, format="multipart"
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["imported"] == 1
+        assert ReviewVote.objects.filter(review=review, user=voter).exists()
@@ -0,0 +1,133 @@
+import uuid
+
+import pytest
+
+from test_task.reviews.imports import ReviewImporter, ReviewVoteImporter
+from test_task.reviews.models import Review, ReviewVote
+
+
+@pytest.fixture
+def captured_invalidations(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        "test_task.reviews.imports.invalidate_location_reviews_many",
+        lambda location_ids: calls.append(set(location_ids)),
+    )
+    monkeypatch.setattr(
+        "test_task.reviews.imports.invalidate_review_lists",
+        lambda location_ids: calls.append(set(location_ids)),
+    )
+    return calls
+
+
+@pytest.mark.django_db
+class TestReviewImporter:
+
+    def test_upserts_reviews(
+        self, location_factory, user_factory, review_factory, captured_invalidations
+    ):
+        location = location_factory()
+        users = user_factory.create_batch(2)
+        existing = review_factory(location=location, user=users[0], rating=1)
+        rows = [
+            {
+                "location": str(location.pk),
+                "user": str(user.pk),
+                "title": "Great",
+                "body": "Nice place",
+                "rating": 5,
+            }
+            for user in users
+        ]
+
+        report = ReviewImporter().run(rows)
+
+        assert report == {"imported": 2, "error_count": 0, "errors": []}
+        assert Review.objects.filter(location=location).count() == 2
+        existing.refresh_from_db()
+        assert existing.rating == 5
+        assert existing.title == "Great"
+        assert captured_invalidations == [{location.pk}]
+
+    def test_reports_bad_rows(self, location_factory, user_factory):
+        location = location_factory()
+        user = user_factory()
+        rows = [
+            {"location": str(location.pk), "user": str(user.pk), "rating": 9},
+            {
+                "location": str(uuid.uuid4()),
+                "user": str(user.pk),
+                "title": "a",
+                "body": "b",
+                "rating": 3,
+            },
+        ]
+
+        report = ReviewImporter().run(rows)
+
+        assert report["imported"] == 0
+        assert [error["row"] for error in report["errors"]] == [1, 2]
+        assert "rating" in report["errors"][0]["errors"]
+        assert "location" in report["errors"][1]["errors"]
+
+    def test_duplicate_rows_in_batch_keep_last(self, location_factory, user_factory):
+        location = location_factory()
+        user = user_factory()
+        row = {"location": str(location.pk), "user": str(user.pk), "body": "b"}
+
+        report = ReviewImporter().run(
+            [
+                {**row, "title": "first", "rating": 1},
+                {**row, "title": "last", "rating": 2},
+            ]
+        )
+
+        assert report["imported"] == 1
+        assert Review.objects.get(location=location).title == "last"
+
+
+@pytest.mark.django_db
+class TestReviewVoteImporter:
+
+    def test_upserts_votes_by_review_or_author(
+        self, review_factory, review_vote_factory, user_factory, captured_invalidations
+    ):
+        review = review_factory()
+        other_review = review_factory()
+        voter = user_factory()
+        vote = review_vote_factory(review=review, user=voter, upvote=True)
+        rows = [
+            {"review": str(review.pk), "user": str(voter.pk), "vote": -1},
+            {
+                "location": str(other_review.location_id),
+                "author": str(other_review.user_id),
+                "user": str(voter.pk),
+                "vote": 1,
+            },
+        ]
+
+        report = ReviewVoteImporter(batch_size=10).run(rows)
+
+        assert report == {"imported": 2, "error_count": 0, "errors": []}
+        vote.refresh_from_db()
+        assert vote.vote == ReviewVote.Vote.DOWNVOTE
+        review.refresh_from_db()
+        assert (review.upvote_count, review.downvote_count) == (0, 1)
+        assert ReviewVote.objects.get(review=other_review, user=voter).vote == 1
+        assert captured_invalidations == [
+            {review.location_id, other_review.location_id}
+        ]
+
+    def test_reports_unknown_review(self, user_factory):
+        user = user_factory()
+        rows = [
+            {"review": str(uuid.uuid4()), "user": str(user.pk), "vote": 1},
+            {"user": str(user.pk), "vote": 1},
+        ]
+
+        report = ReviewVoteImporter().run(rows)
+
+        assert report["imported"] == 0
+        errors = {error["row"]: error["errors"] for error in report["errors"]}
+        assert "review" in errors[1]
+        assert "non_field_errors" in errors[2]
@@ -1,28 +1,45 @@
+import io
+import math
+from datetime import timedelta
+
 import pytest
+from django.core.management import call_command
 from django.db import IntegrityError
+from django.utils import timezone
 
 from conftest import review_vote_factory
-from test_task.reviews.models import Review
+from test_task.reviews.models import Review, ReviewVote
 
 
 @pytest.mark.django_db
 class TestReviewQuerySet:
 
-    def test_annotate_upvote_count(self, review_factory, review_vote_factory):
+    def test_annotate_actual_upvote_count(self, review_factory, review_vote_factory):
         review = review_factory()
         upvotes = review_vote_factory.create_batch(2, upvote=True, review=review)
         downvotes = review_vote_factory.create_batch(3, downvote=True, review=review)
 
-        review = Review.objects.annotate_upvote_count().get(pk=review.pk)
-        assert review.upvote_count == len(upvotes)
+        review = Review.objects.annotate_actual_upvote_count().get(pk=review.pk)
+        assert review.actual_upvote_count == len(upvotes)
 
-    def test_annotate_downvote_count(self, review_factory, review_vote_factory):
+    def test_annotate_actual_downvote_count(self, review_factory, review_vote_factory):
         review = review_factory()
         upvotes = review_vote_factory.create_batch(2, upvote=True, review=review)
         downvotes = review_vote_factory.create_batch(3, downvote=True, review=review)
 
-        review = Review.objects.annotate_downvote_count().get(pk=review.pk)
-        assert review.upvote_count == len(downvotes)
+        review = Review.objects.annotate_actual_downvote_count().get(pk=review.pk)
+        assert review.actual_downvote_count == len(downvotes)
+
+    def test_refresh_vote_counts(self, review_factory, review_vote_factory):
+        review = review_factory()
+        review_vote_factory.create_batch(2, upvote=True, review=review)
+        review_vote_factory(downvote=True, review=review)
+        Review.objects.filter(pk=review.pk).update(upvote_count=10, downvote_count=10)
+
+        Review.objects.filter(pk=review.pk).refresh_vote_counts()
+
+        review.refresh_from_db()
+        assert (review.upvote_count, review.downvote_count) == (2, 1)
 
 
 @pytest.mark.django_db
@@ -68,3 +85,111 @@ class TestReviewVoteModel:
 
         vote = review_vote_factory(review=review, user=user, upvote=True)
         assert str(vote) == "john Upvoted my review"
+
+
+@pytest.mark.django_db
+class TestReviewVoteCounts:
+
+    def test_counts_follow_vote_lifecycle(self, review_factory, review_vote_factory):
+        review = review_factory()
+        vote = review_vote_factory(review=review, upvote=True)
+        review_vote_factory(review=review, downvote=True)
+
+        review.refresh_from_db()
+        assert (review.upvote_count, review.downvote_count) == (1, 1)
+
+        vote = ReviewVote.objects.get(pk=vote.pk)
+        vote.vote = ReviewVote.Vote.DOWNVOTE
+        vote.save()
+        review.refresh_from_db()
+        assert (review.upvote_count, review.downvote_count) == (0, 2)
+
+        vote.delete()
+        review.refresh_from_db()
+        assert (review.upvote_count, review.downvote_count) == (0, 1)
+
+    def test_resaving_same_vote_keeps_counts(self, review_factory, review_vote_factory):
+        review = review_factory()
+        vote = review_vote_factory(review=review, upvote=True)
+
+        vote.save()
+        ReviewVote.objects.get(pk=vote.pk).save()
+
+        review.refresh_from_db()
+        assert review.upvote_count == 1
+
+    def test_helpfulness_is_wilson_lower_bound(
+        self, review_factory, review_vote_factory
+    ):
+        review = review_factory()
+        assert review.helpfulness == 0
+
+        review_vote_factory.create_batch(3, review=review, upvote=True)
+        review_vote_factory(review=review, downvote=True)
+
+        review.refresh_from_db()
+        z, n, p = 1.96, 4, 3 / 4
+        expected = (
+            p + z * z / (2 * n) - z * math.sqrt((p * (1 - p) + z * z / (4 * n)) / n)
+        ) / (1 + z * z / n)
+        assert review.helpfulness == pytest.approx(expected)
+
+    def test_more_votes_rank_higher(self, review_factory, review_vote_factory):
+        single = review_factory()
+        review_vote_factory(review=single, upvote=True)
+        popular = review_factory()
+        review_vote_factory.create_batch(9, review=popular, upvote=True)
+        review_vote_factory(review=popular, downvote=True)
+
+        single.refresh_from_db()
+        popular.refresh_from_db()
+        assert popular.helpfulness > single.helpfulness
+
+    def test_votes_bump_updated_at(self, review_factory, review_vote_factory):
+        past = timezone.now() - timedelta(days=1)
+        review = review_factory()
+        Review.objects.filter(pk=review.pk).update(created_at=past, updated_at=past)
+
+        review_vote_factory(review=review, upvote=True)
+
+        review.refresh_from_db()
+        assert review.updated_at > past
+
+    def test_refresh_keeps_updated_at_of_unchanged_reviews(
+        self, review_factory, review_vote_factory
+    ):
+        past = timezone.now() - timedelta(days=1)
+        review = review_factory()
+        drifted = review_factory()
+        review_vote_factory(review=review, upvote=True)
+        review_vote_factory(review=drifted, upvote=True)
+        Review.objects.update(created_at=past, updated_at=past)
+        Review.objects.filter(pk=drifted.pk).update(upvote_count=5)
+
+        Review.objects.refresh_vote_counts()
+
+        review.refresh_from_db()
+        drifted.refresh_from_db()
+        assert review.updated_at == past
+        assert drifted.updated_at > past
+
+    def test_reconcile_command(self, review_factory, review_vote_factory):
+        past = timezone.now() - timedelta(days=1)
+        review = review_factory()
+        review_vote_factory(review=review, upvote=True)
+        untouched = review_factory()
+        review_vote_factory(review=untouched, downvote=True)
+        Review.objects.update(created_at=past, updated_at=past)
+        Review.objects.filter(pk=review.pk).update(upvote_count=5)
+
+        stdout = io.StringIO()
+        call_command("reconcile_vote_counts", stdout=stdout)
+
+        review.refresh_from_db()
+        assert review.upvote_count == 1
+        assert "Fixed vote counts of 1 reviews." in stdout.getvalue()
+
+        # коректні лічильники не чіпаються
+        untouched.refresh_from_db()
+        assert (untouched.upvote_count, untouched.downvote_count) == (0, 1)
+        assert untouched.updated_at == past